@@ -5,44 +5,96 @@
 统一管理项目的配置信息，包括环境变量加载和常量定义
 """
 
+import functools
+import logging
 import os
+import types
 from pathlib import Path
-from typing import Optional
+from typing import Mapping, Optional
 
 try:
-    from dotenv import load_dotenv
+    from dotenv import dotenv_values
 except ImportError:
 
-    def load_dotenv(*args, **kwargs):
+    def dotenv_values(*args, **kwargs):
         """备用函数，避免导入错误"""
-        pass
+        return {}
 
 
-# 加载.env文件
 project_root = Path(__file__).parent
 env_file = project_root / ".env"
-if env_file.exists():
-    load_dotenv(env_file)
+_ENV_EXISTS = env_file.exists()
+
+
+@functools.lru_cache(maxsize=1)
+def _env() -> Mapping[str, str]:
+    """
+    解析.env文件并与进程环境变量合并（只解析一次）
+
+    与load_dotenv语义一致：进程环境变量优先于.env中的同名配置，
+    .env中的配置同时写入os.environ，供直接读取环境变量的第三方库使用（如HTTPS_PROXY）
+    """
+    if _ENV_EXISTS:
+        for key, value in dotenv_values(env_file).items():
+            if value is not None:
+                os.environ.setdefault(key, value)
+    return types.MappingProxyType(dict(os.environ))
+
+
+def getenv(key: str, default: Optional[str] = None) -> Optional[str]:
+    """读取配置项（.env + 环境变量），用法同os.getenv"""
+    return _env().get(key, default)
+
+
+def _getenv_int(key: str, default: int, minimum: int = 1) -> int:
+    """
+    读取整数配置项，格式错误时使用默认值并记录警告，结果不小于minimum
+
+    Args:
+        key: 配置项名称
+        default: 未配置或格式错误时的默认值
+        minimum: 允许的最小值
+
+    Returns:
+        int: 配置值
+    """
+    raw = getenv(key)
+    if raw is None or not raw.strip():
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        logging.getLogger(__name__).warning(
+            "配置项%s的值无效: %r，使用默认值%d", key, raw, default
+        )
+        return default
+    if value < minimum:
+        logging.getLogger(__name__).warning(
+            "配置项%s的值%d小于最小值%d，已按%d处理", key, value, minimum, minimum
+        )
+        return minimum
+    return value
+
 
 # 飞书配置
 # 注意：以下配置需要根据您自己的飞书应用进行修改
 # 详见文档: docs/FEISHU_CARD_SETUP.md
 FEISHU_CONFIG = {
-    "app_id": os.getenv("app_id"),
-    "app_secret": os.getenv("app_secret"),
-    "template_id": os.getenv("FEISHU_TEMPLATE_ID", "YOUR_TEMPLATE_ID"),  # 替换为您的卡片模板ID
-    "template_version_name": os.getenv("FEISHU_TEMPLATE_VERSION", "1.0.0"),  # 替换为您的卡片版本号
-    "user_open_id": os.getenv("FEISHU_USER_OPEN_ID", "YOUR_USER_OPEN_ID"),  # 替换为接收消息的用户open_id
+    "app_id": getenv("app_id"),
+    "app_secret": getenv("app_secret"),
+    "template_id": getenv("FEISHU_TEMPLATE_ID", "YOUR_TEMPLATE_ID"),  # 替换为您的卡片模板ID
+    "template_version_name": getenv("FEISHU_TEMPLATE_VERSION", "1.0.0"),  # 替换为您的卡片版本号
+    "user_open_id": getenv("FEISHU_USER_OPEN_ID", "YOUR_USER_OPEN_ID"),  # 替换为接收消息的用户open_id
 }
 
 # B站配置
 BILIBILI_CONFIG = {
-    "SESSDATA": os.getenv("SESSDATA"),
-    "bili_jct": os.getenv("bili_jct"),
-    "buvid3": os.getenv("buvid3"),
-    "DedeUserID": os.getenv("DedeUserID"),
-    "DedeUserID__ckMd5": os.getenv("DedeUserID__ckMd5"),
-    "refresh_token": os.getenv("refresh_token"),  # 添加refresh_token支持
+    "SESSDATA": getenv("SESSDATA"),
+    "bili_jct": getenv("bili_jct"),
+    "buvid3": getenv("buvid3"),
+    "DedeUserID": getenv("DedeUserID"),
+    "DedeUserID__ckMd5": getenv("DedeUserID__ckMd5"),
+    "refresh_token": getenv("refresh_token"),  # 添加refresh_token支持
 }
 
 # API配置
@@ -51,16 +103,20 @@ BILI_VIDEO_API = "https://api.bilibili.com/x/web-interface/view"
 
 # User-Agent配置（从.env读取，如果没有则使用默认值）
 USER_AGENT = (
-    os.getenv("USER_AGENT")
+    getenv("USER_AGENT")
     or "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 )
 
 # AI总结服务配置
 AI_CONFIG = {
-    "service": os.getenv("AI_SERVICE", "deepseek"),
-    "api_key": os.getenv("AI_API_KEY"),
-    "base_url": os.getenv("AI_BASE_URL"),  # 可选，不设置则根据service自动选择
-    "model": os.getenv("AI_MODEL"),  # 可选，不设置则根据service自动选择
+    "service": getenv("AI_SERVICE", "deepseek"),
+    "api_key": getenv("AI_API_KEY"),
+    "base_url": getenv("AI_BASE_URL"),  # 可选，不设置则根据service自动选择
+    "model": getenv("AI_MODEL"),  # 可选，不设置则根据service自动选择
+    "max_concurrency": _getenv_int("AI_MAX_CONCURRENCY", 4),  # 同时总结的视频数（至少为1）
+    "batch_size": _getenv_int("AI_BATCH_SIZE", 1),  # 每次AI请求合并总结的视频数（至少为1）
+    # 单次AI请求的输出token上限，批量总结按此拆分批次（deepseek-chat为8192）
+    "max_output_tokens": _getenv_int("AI_MAX_OUTPUT_TOKENS", 8192),
 }
 
 # 反爬虫配置
@@ -71,24 +127,28 @@ ANTI_BAN_CONFIG = {
 }
 
 
+# B站Cookie字符串（配置在进程生命周期内不变，启动时构建一次）
+BILI_COOKIE: Optional[str] = (
+    "; ".join(f"{key}={value}" for key, value in BILIBILI_CONFIG.items() if value)
+    or None
+)
+
+
 def build_bilibili_cookie() -> Optional[str]:
     """构建B站请求所需的Cookie字符串"""
-    parts = []
-    for key, value in BILIBILI_CONFIG.items():
-        if value:
-            parts.append(f"{key}={value}")
-    return "; ".join(parts) if parts else None
+    return BILI_COOKIE
 
 
+@functools.lru_cache(maxsize=1)
 def get_config_status() -> dict:
-    """获取配置状态，用于诊断"""
+    """获取配置状态，用于诊断（配置在进程生命周期内不变，结果会被缓存，请勿修改）"""
     return {
-        "env_file_exists": env_file.exists(),
+        "env_file_exists": _ENV_EXISTS,
         "feishu_configured": bool(
             FEISHU_CONFIG["app_id"] and FEISHU_CONFIG["app_secret"]
         ),
         "bilibili_configured": bool(BILIBILI_CONFIG["SESSDATA"]),
-        "cookie_available": bool(build_bilibili_cookie()),
+        "cookie_available": bool(BILI_COOKIE),
     }
 
 
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""
+JSON序列化工具模块
+
+安装了orjson时使用orjson（C实现，更快），否则回退到标准库json
+"""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def loads(data: Union[bytes, bytearray, str]) -> Any:
+    """
+    解析JSON
+
+    Args:
+        data: JSON文本（bytes或str）
+
+    Returns:
+        解析后的Python对象
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """
+    序列化为UTF-8编码的JSON（不转义非ASCII字符）
+
+    Args:
+        obj: 要序列化的对象
+        indent: 是否使用2空格缩进
+
+    Returns:
+        bytes: JSON内容
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None).encode(
+        "utf-8"
+    )
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""
+按需导入工具模块
+
+lark-oapi、bilibili-api等SDK导入耗时较长，启动时只检查是否安装，
+首次真正用到时才导入
+"""
+
+import functools
+import importlib
+import importlib.util
+from types import ModuleType
+
+
+def module_available(name: str) -> bool:
+    """
+    检查模块是否已安装（只查找，不执行导入）
+
+    Args:
+        name: 顶层模块名
+
+    Returns:
+        bool: 是否可以导入
+    """
+    return importlib.util.find_spec(name) is not None
+
+
+@functools.lru_cache(maxsize=None)
+def import_module(name: str) -> ModuleType:
+    """
+    按需导入模块（首次调用时加载，之后直接返回缓存的模块对象）
+
+    Args:
+        name: 完整模块名，如"lark_oapi.api.im.v1"
+
+    Returns:
+        ModuleType: 导入的模块
+    """
+    return importlib.import_module(name)
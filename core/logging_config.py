@@ -5,9 +5,86 @@
 统一管理项目的日志配置
 """
 
+import atexit
 import logging
+import logging.handlers
 import os
-from typing import Optional
+import queue
+import sys
+import threading
+from typing import Optional, Tuple
+
+# 标准输出是否已切换为UTF-8编码（只需处理一次）
+_STDOUT_RECONFIGURED = False
+
+# 后台写日志的监听线程（控制台/文件写入不阻塞事件循环）
+_queue_listener: Optional[logging.handlers.QueueListener] = None
+
+# 文件日志缓冲配置：攒够一批或遇到ERROR立即落盘，否则定时刷新
+FILE_BUFFER_CAPACITY = 512
+FILE_FLUSH_INTERVAL = 1.0
+
+# 日志文件轮转配置：单个文件最大10MB，保留5个历史文件
+LOG_FILE_MAX_BYTES = 10 * 1024 * 1024
+LOG_FILE_BACKUP_COUNT = 5
+
+
+class _CachedTimeFormatter(logging.Formatter):
+    """
+    按秒缓存时间字符串的Formatter
+
+    日期格式精确到秒，同一秒内的日志复用上一次strftime的结果。
+    缓存以(秒, 文本)元组整体替换，多线程同时格式化时也不会读到不匹配的组合
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cached: Tuple[Optional[int], str] = (None, "")
+
+    def formatTime(
+        self, record: logging.LogRecord, datefmt: Optional[str] = None
+    ) -> str:
+        second = int(record.created)
+        cached_second, cached_time = self._cached
+        if second != cached_second:
+            cached_time = super().formatTime(record, datefmt)
+            self._cached = (second, cached_time)
+        return cached_time
+
+
+def _make_formatter() -> logging.Formatter:
+    """创建项目统一格式的formatter"""
+    return _CachedTimeFormatter(
+        fmt="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+
+
+def _ensure_utf8_stdout() -> None:
+    """确保控制台输出使用UTF-8编码，避免Windows乱码"""
+    global _STDOUT_RECONFIGURED
+    if _STDOUT_RECONFIGURED:
+        return
+    _STDOUT_RECONFIGURED = True
+
+    # 已是UTF-8编码（如启用了UTF-8模式）时无需重新配置
+    encoding = (getattr(sys.stdout, "encoding", None) or "").lower()
+    if encoding in ("utf-8", "utf8"):
+        return
+    if hasattr(sys.stdout, "reconfigure"):
+        sys.stdout.reconfigure(encoding="utf-8")
+
+
+def _start_periodic_flush(handler: logging.Handler, interval: float) -> None:
+    """启动后台线程定时刷新缓冲日志，限制异常退出时的丢失窗口"""
+    stop_event = threading.Event()
+
+    def _flush_loop():
+        while not stop_event.wait(interval):
+            handler.flush()
+
+    threading.Thread(target=_flush_loop, name="log-flush", daemon=True).start()
+    atexit.register(stop_event.set)
 
 
 def configure_logging(
@@ -24,6 +101,8 @@ def configure_logging(
     Returns:
         logging.Logger: 配置好的根logger
     """
+    global _queue_listener
+
     os.makedirs(log_dir, exist_ok=True)
 
     # 配置根logger
@@ -32,29 +111,50 @@ def configure_logging(
 
     # 避免重复添加处理器
     if not root_logger.handlers:
-        formatter = logging.Formatter(
-            fmt="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-            datefmt="%Y-%m-%d %H:%M:%S",
-        )
+        # 控制台在监听线程中格式化，文件日志在定时刷新线程中格式化，
+        # 各用一个formatter，时间缓存互不干扰
 
         # 控制台处理器 - 设置UTF-8编码避免Windows乱码
-        import sys
-
+        _ensure_utf8_stdout()
         console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setFormatter(formatter)
+        console_handler.setFormatter(_make_formatter())
         console_handler.setLevel(level)
-        # 确保控制台输出使用UTF-8编码
-        if hasattr(sys.stdout, "reconfigure"):
-            sys.stdout.reconfigure(encoding="utf-8")
 
         # 文件处理器
         log_path = os.path.join(log_dir, log_file)
-        file_handler = logging.FileHandler(log_path, encoding="utf-8")
-        file_handler.setFormatter(formatter)
+        file_handler = logging.handlers.RotatingFileHandler(
+            log_path,
+            maxBytes=LOG_FILE_MAX_BYTES,
+            backupCount=LOG_FILE_BACKUP_COUNT,
+            encoding="utf-8",
+            delay=True,
+        )
+        file_handler.setFormatter(_make_formatter())
         file_handler.setLevel(level)
 
-        root_logger.addHandler(console_handler)
-        root_logger.addHandler(file_handler)
+        # 批量写入文件，减少每条日志一次write()的开销
+        buffered_file_handler = logging.handlers.MemoryHandler(
+            capacity=FILE_BUFFER_CAPACITY,
+            flushLevel=logging.ERROR,
+            target=file_handler,
+            flushOnClose=True,
+        )
+        buffered_file_handler.setLevel(level)
+        _start_periodic_flush(buffered_file_handler, FILE_FLUSH_INTERVAL)
+
+        # 实际写入交给后台线程，调用方只需把日志记录放入队列
+        log_queue = queue.SimpleQueue()
+        _queue_listener = logging.handlers.QueueListener(
+            log_queue,
+            console_handler,
+            buffered_file_handler,
+            respect_handler_level=True,
+        )
+        _queue_listener.start()
+        atexit.register(buffered_file_handler.close)
+        atexit.register(_queue_listener.stop)
+
+        root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
 
     return root_logger
 
@@ -6,18 +6,20 @@ AI视频机器人主程序
 """
 
 import asyncio
+import os
 import sys
 from pathlib import Path
 
-# 添加项目根目录到Python路径
-project_root = Path(__file__).parent
-sys.path.insert(0, str(project_root))
+# 添加项目根目录到Python路径（直接运行脚本时已在路径中，无需重复插入）
+project_root = str(Path(__file__).parent)
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
 
 from config import get_config_status
 
 # 导入核心模块
 from core import configure_logging
-from services import FeishuBot, MonitorService
+from services import FeishuBot
 
 # 导入服务模块
 from services.ai_summary import AISummaryService
@@ -57,14 +59,15 @@ class AIVideoBot:
                 self.feishu_bot.LEVEL_INFO, "机器人启动成功", content
             )
         except Exception as e:
-            self.logger.warning(f"发送启动通知失败: {e}")
+            self.logger.warning("发送启动通知失败: %s", e)
 
     def _log_config_status(self, status: dict):
         """记录配置状态"""
-        self.logger.info("配置状态检查:")
-        for key, value in status.items():
-            emoji = "✅" if value else "❌"
-            self.logger.info(f"  {emoji} {key}: {value}")
+        lines = ["配置状态检查:"]
+        lines.extend(
+            f"  {'✅' if value else '❌'} {key}: {value}" for key, value in status.items()
+        )
+        self.logger.info("\n".join(lines))
 
         if not status["feishu_configured"]:
             self.logger.warning("飞书应用未配置，将使用Mock模式")
@@ -81,7 +84,7 @@ class AIVideoBot:
             str: 总结内容，失败返回空字符串
         """
         try:
-            self.logger.info(f"开始总结视频: {video_url}")
+            self.logger.info("开始总结视频: %s", video_url)
 
             success, message, summary_links, summary_contents = (
                 await self.ai_service.summarize_videos([video_url])
@@ -92,11 +95,11 @@ class AIVideoBot:
                 self.logger.info("视频总结成功")
                 return summary_contents[0]
             else:
-                self.logger.error(f"视频总结失败: {message}")
+                self.logger.error("视频总结失败: %s", message)
                 return ""
 
         except Exception as e:
-            self.logger.error(f"视频总结异常: {e}")
+            self.logger.error("视频总结异常: %s", e)
             return ""
 
     async def send_notification(self, influencer: str, platform: str, content: str):
@@ -118,12 +121,12 @@ class AIVideoBot:
                 )
 
             if success:
-                self.logger.info(f"通知发送成功: {influencer} - {platform}")
+                self.logger.info("通知发送成功: %s - %s", influencer, platform)
             else:
-                self.logger.warning(f"通知发送失败: {influencer} - {platform}")
+                self.logger.warning("通知发送失败: %s - %s", influencer, platform)
 
         except Exception as e:
-            self.logger.error(f"发送通知异常: {e}")
+            self.logger.error("发送通知异常: %s", e)
 
     async def start_monitoring(self, once: bool = False):
         """启动动态监控
@@ -134,14 +137,17 @@ class AIVideoBot:
         try:
             self.logger.info("启动动态监控...")
 
+            # 监控服务只在监控模式下需要，按需导入
+            from services import MonitorService
+
             # 创建监控服务
             monitor_service = MonitorService(
                 feishu_bot=self.feishu_bot, summarizer=self.ai_service
             )
 
-            # 加载创作者列表
-            creators = monitor_service.load_creators_from_file()
-            self.logger.info(f"加载了 {len(creators)} 个创作者")
+            # 加载创作者列表（文件读写放到线程中执行）
+            creators = await asyncio.to_thread(monitor_service.load_creators_from_file)
+            self.logger.info("加载了 %d 个创作者", len(creators))
 
             # 发送监控启动通知
             try:
@@ -157,13 +163,13 @@ class AIVideoBot:
                     self.feishu_bot.LEVEL_INFO, "监控服务启动", content
                 )
             except Exception as e:
-                self.logger.warning(f"发送监控启动通知失败: {e}")
+                self.logger.warning("发送监控启动通知失败: %s", e)
 
             # 启动监控
             await monitor_service.start_monitoring(creators, once=once)
 
         except Exception as e:
-            self.logger.error(f"动态监控异常: {e}")
+            self.logger.error("动态监控异常: %s", e)
             # 发送监控异常通知
             try:
                 await self.feishu_bot.send_system_notification(
@@ -177,10 +183,15 @@ class AIVideoBot:
     async def cleanup(self):
         """清理资源"""
         try:
-            # AI总结服务不需要清理浏览器资源
+            # AI总结服务不需要清理浏览器资源，只需关闭共享的HTTP会话和AI客户端连接池
+            from services.ai_summary.ai_client import close_http_client
+            from services.http_session import close_session
+
+            await close_session()
+            await close_http_client()
             self.logger.info("资源清理完成")
         except Exception as e:
-            self.logger.warning(f"资源清理警告: {e}")
+            self.logger.warning("资源清理警告: %s", e)
 
 
 async def main():
@@ -211,16 +222,16 @@ async def main():
             print("正在重置监控状态...")
             state_file = Path("data/bilibili_state.json")
             if state_file.exists():
-                # 备份当前状态
-                import shutil
-
+                # 备份当前状态（直接重命名，无需复制文件内容）
                 backup_file = state_file.with_suffix(".backup.json")
-                shutil.copy(state_file, backup_file)
+                os.replace(state_file, backup_file)
                 print(f"已备份当前状态到: {backup_file}")
 
-                # 清空状态
-                with open(state_file, "w", encoding="utf-8") as f:
+                # 清空状态（先写临时文件再原子替换，避免出现半写入的状态文件）
+                tmp_file = state_file.with_suffix(".json.tmp")
+                with open(tmp_file, "w", encoding="utf-8") as f:
                     f.write("{}")
+                os.replace(tmp_file, state_file)
                 print("状态已重置，将重新推送最近48小时内的动态")
 
         # 发送启动通知（非测试模式）
@@ -305,4 +316,13 @@ async def main():
 
 if __name__ == "__main__":
     print("AI视频机器人启动中...")
+
+    # 如果安装了uvloop（仅支持Linux/macOS），使用更高效的事件循环
+    try:
+        import uvloop
+
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+
     asyncio.run(main())
@@ -1,9 +1,29 @@
 # -*- coding: utf-8 -*-
 """
 服务模块
+
+子模块按需导入：只有在首次访问对应属性时才加载（PEP 562）
 """
 
-from .feishu import FeishuBot
-from .monitor import MonitorService
+import importlib
 
 __all__ = ["FeishuBot", "MonitorService"]
+
+# 属性名 -> 所在子模块
+_LAZY_ATTRS = {
+    "FeishuBot": ".feishu",
+    "MonitorService": ".monitor",
+}
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -5,11 +5,43 @@ AI客户端模块
 统一封装对各种AI服务的调用（DeepSeek、智谱AI、通义千问等）
 """
 
+import functools
 import logging
-from typing import Optional
+import string
+from typing import Optional, Tuple
 
+import httpx
 from openai import AsyncOpenAI
 
+# 所有AIClient共享的HTTP连接池（复用keep-alive连接，避免重复TLS握手）
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    """获取共享的httpx客户端（首次调用时创建）"""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            transport=httpx.AsyncHTTPTransport(
+                retries=2,
+                limits=httpx.Limits(
+                    max_keepalive_connections=32, max_connections=64
+                ),
+            ),
+            # 非流式补全在生成结束前没有任何响应数据，读取超时沿用OpenAI SDK的600秒
+            timeout=httpx.Timeout(600.0, connect=10.0),
+            follow_redirects=True,
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """关闭共享的httpx客户端（程序退出前调用）"""
+    global _http_client
+    if _http_client is not None and not _http_client.is_closed:
+        await _http_client.aclose()
+    _http_client = None
+
 
 class AIClient:
     """统一的AI服务客户端，支持多个国内AI服务"""
@@ -30,12 +62,16 @@ class AIClient:
         },
     }
 
+    # summarize_text的默认用户提示词模板
+    DEFAULT_USER_PROMPT_TEMPLATE = "请总结以下内容：\n\n{text}"
+
     def __init__(
         self,
         service: str = "deepseek",
         api_key: Optional[str] = None,
         base_url: Optional[str] = None,
         model: Optional[str] = None,
+        user_prompt_template: Optional[str] = None,
     ):
         """
         初始化AI客户端
@@ -45,6 +81,7 @@ class AIClient:
             api_key: API密钥
             base_url: API地址（可选，不设置则使用默认值）
             model: 模型名称（可选，不设置则使用默认值）
+            user_prompt_template: summarize_text默认使用的用户提示词模板（可选）
         """
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
 
@@ -62,10 +99,19 @@ class AIClient:
         self.base_url = base_url or config["base_url"]
         self.model = model or config["model"]
 
+        # 预先拆分提示词模板，避免每次调用都解析格式字符串
+        self._user_prompt_template = (
+            user_prompt_template or self.DEFAULT_USER_PROMPT_TEMPLATE
+        )
+        self._user_prompt_parts = self._split_prompt_template(
+            self._user_prompt_template
+        )
+
         # 创建OpenAI客户端
         self.client = AsyncOpenAI(
             api_key=api_key,
             base_url=self.base_url,
+            http_client=_get_http_client(),
         )
 
         self.logger.info(
@@ -77,6 +123,7 @@ class AIClient:
         messages: list,
         temperature: float = 0.7,
         max_tokens: Optional[int] = None,
+        response_format: Optional[dict] = None,
     ) -> Optional[str]:
         """
         调用AI进行对话补全
@@ -85,28 +132,34 @@ class AIClient:
             messages: 消息列表，格式为 [{"role": "user", "content": "..."}]
             temperature: 温度参数（0-1），越高越随机
             max_tokens: 最大生成token数
+            response_format: 输出格式（如 {"type": "json_object"}），不设置则为普通文本
 
         Returns:
             AI生成的文本，失败返回None
         """
         try:
             self.logger.debug(
-                f"调用AI服务: model={self.model}, messages={len(messages)}条"
+                "调用AI服务: model=%s, messages=%d条", self.model, len(messages)
             )
 
             # 调用API
+            extra_params = {}
+            if response_format:
+                extra_params["response_format"] = response_format
+
             response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=messages,
                 temperature=temperature,
                 max_tokens=max_tokens,
+                **extra_params,
             )
 
             # 提取返回内容
             if response.choices and len(response.choices) > 0:
                 content = response.choices[0].message.content
                 self.logger.info(
-                    f"AI响应成功，长度: {len(content) if content else 0} 字符"
+                    "AI响应成功，长度: %d 字符", len(content) if content else 0
                 )
                 return content
             else:
@@ -135,14 +188,23 @@ class AIClient:
             总结内容，失败返回None
         """
         try:
-            # 如果没有提供用户提示词模板，使用默认的
-            if not user_prompt_template:
-                user_prompt_template = "请总结以下内容：\n\n{text}"
+            # 如果没有提供用户提示词模板，使用初始化时的模板
+            if user_prompt_template:
+                parts = self._split_prompt_template(user_prompt_template)
+            else:
+                user_prompt_template = self._user_prompt_template
+                parts = self._user_prompt_parts
+
+            # 模板只含单个{text}时直接拼接，其余情况按str.format处理
+            if parts:
+                user_content = parts[0] + text + parts[1]
+            else:
+                user_content = user_prompt_template.format(text=text)
 
             # 构建消息
             messages = [
                 {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt_template.format(text=text)},
+                {"role": "user", "content": user_content},
             ]
 
             # 调用AI
@@ -151,3 +213,33 @@ class AIClient:
         except Exception as e:
             self.logger.error(f"文本总结失败: {e}")
             return None
+
+    @staticmethod
+    @functools.lru_cache(maxsize=32)
+    def _split_prompt_template(template: str) -> Optional[Tuple[str, str]]:
+        """
+        将提示词模板按{text}拆分为前后两段
+
+        只有模板恰好包含一个{text}占位符、且没有转义花括号时才拆分，
+        此时拼接结果与str.format完全一致
+
+        Args:
+            template: 包含{text}占位符的模板
+
+        Returns:
+            (前缀, 后缀)，拼接为 前缀 + 文本 + 后缀；无法拆分时返回None
+        """
+        if "{{" in template or "}}" in template:
+            return None
+        try:
+            fields = [
+                (name, spec, conversion)
+                for _, name, spec, conversion in string.Formatter().parse(template)
+                if name is not None
+            ]
+        except ValueError:
+            return None
+        if fields != [("text", "", None)]:
+            return None
+        prefix, _, suffix = template.partition("{text}")
+        return prefix, suffix
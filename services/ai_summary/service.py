@@ -5,6 +5,7 @@ AI总结服务主模块
 提供视频总结的统一入口和标准化接口
 """
 
+import asyncio
 import logging
 from typing import Dict, List, Optional, Tuple
 
@@ -42,6 +43,9 @@ class AISummaryService:
         # 初始化子服务
         self.subtitle_fetcher = SubtitleFetcher()
 
+        # 限制同时处理的视频数，避免触发AI服务的速率限制
+        self._semaphore = asyncio.Semaphore(AI_CONFIG.get("max_concurrency", 4))
+
         # 初始化AI客户端
         try:
             api_key = AI_CONFIG.get("api_key")
@@ -57,12 +61,14 @@ class AISummaryService:
                 model=AI_CONFIG.get("model"),
             )
 
-            self.summary_generator = SummaryGenerator(self.ai_client)
+            self.summary_generator = SummaryGenerator(
+                self.ai_client, max_output_tokens=AI_CONFIG.get("max_output_tokens")
+            )
 
             self.logger.info("AI总结服务初始化成功")
 
         except Exception as e:
-            self.logger.error(f"AI总结服务初始化失败: {e}")
+            self.logger.error("AI总结服务初始化失败: %s", e)
             raise
 
     async def summarize_videos(
@@ -77,57 +83,39 @@ class AISummaryService:
         Returns:
             Tuple[bool, str, List[str], List[str]]: (是否成功, 结果消息, 总结链接列表, 总结内容列表)
         """
-        self.logger.info(f"开始总结 {len(video_urls)} 个视频")
+        self.logger.info("开始总结 %d 个视频", len(video_urls))
 
         summary_links = []  # AI服务不生成链接，返回空列表
-        summary_contents = []
-        failed_videos = []
+        # 按视频序号预分配结果槽位，保证与video_urls顺序一致
+        summary_contents = [""] * len(video_urls)
+        failed = [False] * len(video_urls)
 
         try:
-            for i, video_url in enumerate(video_urls):
-                self.logger.info(
-                    f"处理第 {i + 1}/{len(video_urls)} 个视频: {video_url}"
+            batch_size = AI_CONFIG.get("batch_size", 1)
+            if batch_size > 1 and len(video_urls) > 1:
+                # 多个视频合并到同一次AI请求中总结
+                results = await self._summarize_batched(video_urls, batch_size)
+            else:
+                # 各视频互不依赖，并发处理（并发数由信号量限制）
+                results = await asyncio.gather(
+                    *(
+                        self._summarize_one(i, len(video_urls), video_url)
+                        for i, video_url in enumerate(video_urls)
+                    )
                 )
 
-                try:
-                    # 1. 获取字幕
-                    self.logger.info(f"步骤1: 获取字幕...")
-                    subtitle = await self.subtitle_fetcher.fetch_subtitle(video_url)
-
-                    if not subtitle:
-                        error_msg = f"获取字幕失败: {video_url}"
-                        self.logger.error(error_msg)
-                        failed_videos.append(video_url)
-                        summary_contents.append(f"❌ 获取字幕失败")
-                        continue
-
-                    self.logger.info(f"字幕获取成功，长度: {len(subtitle)} 字符")
-
-                    # 2. 生成总结
-                    self.logger.info(f"步骤2: 生成AI总结...")
-                    summary = await self.summary_generator.generate_summary(subtitle)
-
-                    if not summary:
-                        error_msg = f"生成总结失败: {video_url}"
-                        self.logger.error(error_msg)
-                        failed_videos.append(video_url)
-                        summary_contents.append(f"❌ AI总结生成失败")
-                        continue
-
-                    self.logger.info(f"总结生成成功，长度: {len(summary)} 字符")
-
-                    # 3. 添加到结果
-                    summary_contents.append(summary)
-                    self.logger.info(f"视频 {i + 1} 处理完成")
-
-                except Exception as e:
-                    error_msg = f"处理视频失败: {video_url}, 错误: {str(e)}"
-                    self.logger.error(error_msg, exc_info=True)
-                    failed_videos.append(video_url)
-                    summary_contents.append(f"❌ 处理失败: {str(e)}")
+            for i, (ok, content) in enumerate(results):
+                summary_contents[i] = content
+                failed[i] = not ok
+
+            failed_videos = [
+                video_url
+                for video_url, is_failed in zip(video_urls, failed)
+                if is_failed
+            ]
 
             # 4. 生成结果消息
-            success_count = len(video_urls) - len(failed_videos)
+            success_count = len(video_urls) - sum(failed)
             if success_count > 0:
                 if len(failed_videos) == 0:
                     result_message = f"成功总结 {success_count} 个视频"
@@ -180,6 +168,108 @@ class AISummaryService:
                     pass
             return False, error_msg, [], []
 
+    async def _summarize_one(
+        self, index: int, total: int, video_url: str
+    ) -> Tuple[bool, str]:
+        """
+        处理单个视频：获取字幕并生成总结
+
+        Args:
+            index: 视频序号（从0开始）
+            total: 视频总数
+            video_url: 视频URL
+
+        Returns:
+            Tuple[bool, str]: (是否成功, 总结内容或失败提示)
+        """
+        async with self._semaphore:
+            self.logger.info("处理第 %d/%d 个视频: %s", index + 1, total, video_url)
+
+            try:
+                # 1. 获取字幕
+                self.logger.info("步骤1: 获取字幕...")
+                subtitle = await self.subtitle_fetcher.fetch_subtitle(video_url)
+
+                if not subtitle:
+                    self.logger.error("获取字幕失败: %s", video_url)
+                    return False, "❌ 获取字幕失败"
+
+                self.logger.info("字幕获取成功，长度: %d 字符", len(subtitle))
+
+                # 2. 生成总结
+                self.logger.info("步骤2: 生成AI总结...")
+                summary = await self.summary_generator.generate_summary(subtitle)
+
+                if not summary:
+                    self.logger.error("生成总结失败: %s", video_url)
+                    return False, "❌ AI总结生成失败"
+
+                self.logger.info("总结生成成功，长度: %d 字符", len(summary))
+
+                # 3. 返回结果
+                self.logger.info("视频 %d 处理完成", index + 1)
+                return True, summary
+
+            except Exception as e:
+                self.logger.error(
+                    "处理视频失败: %s, 错误: %s", video_url, e, exc_info=True
+                )
+                return False, f"❌ 处理失败: {str(e)}"
+
+    async def _summarize_batched(
+        self, video_urls: List[str], batch_size: int
+    ) -> List[Tuple[bool, str]]:
+        """
+        批量处理视频：先并发获取所有字幕，再每batch_size个合并为一次AI请求
+
+        Args:
+            video_urls: 视频URL列表
+            batch_size: 每次AI请求包含的视频数
+
+        Returns:
+            List[Tuple[bool, str]]: 与video_urls一一对应的(是否成功, 总结内容或失败提示)
+        """
+        self.logger.info("步骤1: 批量获取 %d 个视频的字幕...", len(video_urls))
+        subtitles = await self.subtitle_fetcher.fetch_subtitle_batch(video_urls)
+
+        results: List[Tuple[bool, str]] = [(False, "")] * len(video_urls)
+        pending = []
+        for i, (video_url, subtitle) in enumerate(zip(video_urls, subtitles)):
+            if isinstance(subtitle, Exception):
+                self.logger.error("处理视频失败: %s, 错误: %s", video_url, subtitle)
+                results[i] = (False, f"❌ 处理失败: {subtitle}")
+            elif not subtitle:
+                self.logger.error("获取字幕失败: %s", video_url)
+                results[i] = (False, "❌ 获取字幕失败")
+            else:
+                pending.append(i)
+
+        # 每批的总输出不能超过服务商的单次输出token上限
+        batch_size = min(batch_size, self.summary_generator.max_batch_size)
+        batches = [
+            pending[start : start + batch_size]
+            for start in range(0, len(pending), batch_size)
+        ]
+
+        async def summarize(batch: List[int]) -> List[Optional[str]]:
+            async with self._semaphore:
+                return await self.summary_generator.generate_summaries_batch(
+                    [subtitles[i] for i in batch]
+                )
+
+        self.logger.info("步骤2: 分 %d 批生成AI总结...", len(batches))
+        batch_summaries = await asyncio.gather(*(summarize(b) for b in batches))
+
+        for batch, summaries in zip(batches, batch_summaries):
+            for i, summary in zip(batch, summaries):
+                if summary:
+                    results[i] = (True, summary)
+                else:
+                    self.logger.error("生成总结失败: %s", video_urls[i])
+                    results[i] = (False, "❌ AI总结生成失败")
+
+        return results
+
     async def get_service_statistics(self) -> Dict:
         """
         获取服务统计信息
@@ -5,32 +5,123 @@
 从B站视频获取AI生成的字幕文本
 """
 
-import json
+import asyncio
 import logging
+import os
 import re
-from typing import Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Union
 
 import aiohttp
-from bilibili_api import video, Credential
+
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
 
 from config import BILIBILI_CONFIG
+from core import json_utils
+from core.lazy_import import import_module
+
+from ..http_session import get_session
+
+# BV号格式：BV + 10位字母数字
+_BV_LENGTH = 12
+_BV_RE = re.compile(r"BV[a-zA-Z0-9]{10}")
+
+# 超过该大小的字幕在线程池中解析，避免阻塞事件循环
+PARSE_IN_THREAD_THRESHOLD = 200 * 1024
+THREAD_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="subtitle-parse")
+
+# 字幕文件大小上限，防止异常响应占用过多内存
+MAX_SUBTITLE_BYTES = 20 * 1024 * 1024
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# 连接阶段快速失败，读取阶段单次等待不超过10秒，整体不超过30秒
+_DEFAULT_TIMEOUT = aiohttp.ClientTimeout(
+    total=30, connect=3, sock_connect=3, sock_read=10
+)
+
+# 下载失败（5xx或连接错误）时的重试次数和退避基数（秒）
+DOWNLOAD_RETRIES = 1
+RETRY_BACKOFF = 0.5
+
+# 字幕文件所在的CDN地址，用于提前建立连接（DNS解析+TLS握手）
+SUBTITLE_CDN_URL = "https://aisubtitle.hdslb.com/"
 
 
 class SubtitleFetcher:
     """B站字幕获取服务"""
 
+    # BV号 -> cid 缓存（cid对同一视频不会变化，避免重复调用get_info）
+    CID_CACHE_PATH = Path("data/cid_cache.json")
+    CID_CACHE_MAX_ENTRIES = 5000
+
+    # 批量获取字幕时的最大并发数
+    BATCH_CONCURRENCY = 8
+
+    # 字幕优先级 -> 日志中的字幕类型描述
+    _SUBTITLE_LABELS = {3: "AI生成字幕", 2: "中文字幕", 1: "第一个字幕"}
+
     def __init__(self):
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
-        
+        self._cid_cache: "OrderedDict[str, int]" = self._load_cid_cache()
+        self._cid_cache_lock = asyncio.Lock()
+
         # 初始化B站凭证（如果配置了的话）
         self.credential = None
         sessdata = BILIBILI_CONFIG.get("SESSDATA")
         if sessdata:
-            self.credential = Credential(sessdata=sessdata)
+            bilibili_api = import_module("bilibili_api")
+            self.credential = bilibili_api.Credential(sessdata=sessdata)
             self.logger.info("已加载B站登录凭证")
         else:
             self.logger.warning("未配置B站SESSDATA，某些字幕可能无法获取")
 
+    def _load_cid_cache(self) -> "OrderedDict[str, int]":
+        """加载cid缓存"""
+        cache: "OrderedDict[str, int]" = OrderedDict()
+        if self.CID_CACHE_PATH.exists():
+            try:
+                data = json_utils.loads(self.CID_CACHE_PATH.read_bytes())
+                if isinstance(data, dict):
+                    cache.update(data)
+            except Exception as e:
+                self.logger.warning("加载cid缓存失败: %s", e)
+        while len(cache) > self.CID_CACHE_MAX_ENTRIES:
+            cache.popitem(last=False)
+        return cache
+
+    @classmethod
+    def _write_cid_cache(cls, data: Dict[str, int]) -> None:
+        """写入cid缓存文件（先写临时文件再原子替换）"""
+        os.makedirs(cls.CID_CACHE_PATH.parent, exist_ok=True)
+        tmp_path = cls.CID_CACHE_PATH.with_suffix(".json.tmp")
+        tmp_path.write_bytes(json_utils.dumps(data))
+        os.replace(tmp_path, cls.CID_CACHE_PATH)
+
+    def _get_cached_cid(self, bvid: str) -> Optional[int]:
+        """从缓存读取cid，命中时标记为最近使用"""
+        cid = self._cid_cache.get(bvid)
+        if cid is not None:
+            self._cid_cache.move_to_end(bvid)
+        return cid
+
+    async def _store_cid(self, bvid: str, cid: int) -> None:
+        """写入cid缓存并持久化，超过上限时淘汰最久未使用的条目"""
+        self._cid_cache[bvid] = cid
+        self._cid_cache.move_to_end(bvid)
+        while len(self._cid_cache) > self.CID_CACHE_MAX_ENTRIES:
+            self._cid_cache.popitem(last=False)
+
+        async with self._cid_cache_lock:
+            try:
+                await asyncio.to_thread(self._write_cid_cache, dict(self._cid_cache))
+            except Exception as e:
+                self.logger.warning("保存cid缓存失败: %s", e)
+
     def extract_bvid(self, video_url: str) -> Optional[str]:
         """
         从视频URL中提取BV号
@@ -42,13 +133,22 @@ class SubtitleFetcher:
             BV号，如果解析失败返回None
         """
         try:
-            # 匹配BV号
-            bv_match = re.search(r"BV([a-zA-Z0-9]+)", video_url)
-            if bv_match:
-                return f"BV{bv_match.group(1)}"
-            return None
+            # 常见URL形如 .../video/BVxxxxxxxxxx，先用str.find直接截取
+            start = video_url.find("BV")
+            if start >= 0:
+                candidate = video_url[start : start + _BV_LENGTH]
+                if (
+                    len(candidate) == _BV_LENGTH
+                    and candidate.isascii()
+                    and candidate[2:].isalnum()
+                ):
+                    return candidate
+
+            # 快速路径失败时再用正则匹配
+            bv_match = _BV_RE.search(video_url)
+            return bv_match.group(0) if bv_match else None
         except Exception as e:
-            self.logger.error(f"提取BV号失败: {e}")
+            self.logger.error("提取BV号失败: %s", e)
             return None
 
     async def fetch_subtitle(self, video_url: str) -> Optional[str]:
@@ -61,86 +161,128 @@ class SubtitleFetcher:
         Returns:
             字幕文本内容（纯文本，已去除时间轴），失败返回None
         """
+        warmup = None
         try:
             # 1. 解析BV号
             bvid = self.extract_bvid(video_url)
             if not bvid:
-                self.logger.error(f"无法从URL中提取BV号: {video_url}")
+                self.logger.error("无法从URL中提取BV号: %s", video_url)
                 return None
 
-            self.logger.info(f"开始获取视频字幕: {bvid}")
+            self.logger.info("开始获取视频字幕: %s", bvid)
 
-            # 2. 创建Video对象并获取视频信息以获得cid
+            # 获取cid和字幕列表的同时预热字幕CDN连接
+            warmup = asyncio.create_task(self._warm_up_subtitle_cdn())
+
+            # 2. 创建Video对象并获取cid（优先使用缓存，未命中时请求视频信息）
+            video = import_module("bilibili_api.video")
             v = video.Video(bvid=bvid, credential=self.credential)
-            video_info = await v.get_info()
-            if not video_info or "cid" not in video_info:
-                self.logger.error(f"无法获取视频 {bvid} 的cid")
-                return None
-            
-            cid = video_info["cid"]
-            self.logger.info(f"获取到视频cid: {cid}")
+            cid = self._get_cached_cid(bvid)
+            if cid is None:
+                video_info = await v.get_info()
+                if not video_info or "cid" not in video_info:
+                    self.logger.error("无法获取视频 %s 的cid", bvid)
+                    return None
+
+                cid = video_info["cid"]
+                self.logger.info("获取到视频cid: %s", cid)
+                await self._store_cid(bvid, cid)
+            else:
+                self.logger.info("使用缓存的视频cid: %s", cid)
 
             # 3. 传入cid参数获取字幕
             subtitle_info = await v.get_subtitle(cid=cid)
 
             if not subtitle_info or "subtitles" not in subtitle_info:
-                self.logger.warning(f"视频 {bvid} 没有可用的字幕")
+                self.logger.warning("视频 %s 没有可用的字幕", bvid)
                 return None
 
             subtitles = subtitle_info["subtitles"]
             if not subtitles:
-                self.logger.warning(f"视频 {bvid} 字幕列表为空")
+                self.logger.warning("视频 %s 字幕列表为空", bvid)
                 return None
 
-            # 4. 选择字幕（优先AI生成的中文字幕）
-            selected_subtitle = None
-            for sub in subtitles:
-                lan = sub.get("lan", "")
-                lan_doc = sub.get("lan_doc", "")
-
-                # 优先选择AI生成的中文字幕
-                if "ai" in lan.lower() or "ai" in lan_doc.lower():
-                    selected_subtitle = sub
-                    self.logger.info(f"选择AI生成字幕: {lan_doc}")
-                    break
-
-            # 如果没有AI字幕，选择第一个中文字幕
-            if not selected_subtitle:
-                for sub in subtitles:
-                    lan = sub.get("lan", "")
-                    if "zh" in lan.lower() or "中" in sub.get("lan_doc", ""):
-                        selected_subtitle = sub
-                        self.logger.info(f"选择中文字幕: {sub.get('lan_doc')}")
-                        break
-
-            # 如果还是没有，选择第一个
-            if not selected_subtitle:
-                selected_subtitle = subtitles[0]
-                self.logger.info(f"选择第一个字幕: {selected_subtitle.get('lan_doc')}")
+            # 4. 选择字幕（优先AI生成字幕，其次中文字幕，否则第一个）
+            selected_subtitle = max(subtitles, key=self._subtitle_priority)
+            label = self._SUBTITLE_LABELS[self._subtitle_priority(selected_subtitle)]
+            self.logger.info("选择%s: %s", label, selected_subtitle.get("lan_doc"))
 
             # 5. 获取字幕URL并下载
             subtitle_url = selected_subtitle.get("subtitle_url")
             if not subtitle_url:
-                self.logger.error(f"字幕URL为空")
+                self.logger.error("字幕URL为空")
                 return None
 
             # 如果URL是相对路径，补充完整
             if subtitle_url.startswith("//"):
                 subtitle_url = "https:" + subtitle_url
 
-            # 6. 下载字幕JSON
+            # 6. 等待连接预热完成后下载字幕JSON
+            await asyncio.gather(warmup, return_exceptions=True)
             subtitle_text = await self._download_subtitle(subtitle_url)
             if not subtitle_text:
                 return None
 
-            self.logger.info(
-                f"成功获取视频 {bvid} 的字幕，长度: {len(subtitle_text)} 字符"
-            )
+            self.logger.info("成功获取视频 %s 的字幕，长度: %d 字符", bvid, len(subtitle_text))
             return subtitle_text
 
         except Exception as e:
-            self.logger.error(f"获取字幕失败: {e}", exc_info=True)
+            self.logger.error("获取字幕失败: %s", e, exc_info=True)
             return None
+        finally:
+            if warmup is not None and not warmup.done():
+                warmup.cancel()
+
+    @staticmethod
+    def _subtitle_priority(sub: dict) -> int:
+        """
+        计算字幕的选择优先级（单次遍历即可配合max选出最佳字幕）
+
+        Returns:
+            3: AI生成字幕，2: 中文字幕，1: 其他
+        """
+        lan = sub.get("lan", "").lower()
+        lan_doc = sub.get("lan_doc", "")
+        if "ai" in lan or "ai" in lan_doc.lower():
+            return 3
+        if "zh" in lan or "中" in lan_doc:
+            return 2
+        return 1
+
+    async def fetch_subtitle_batch(
+        self, video_urls: List[str]
+    ) -> List[Union[Optional[str], BaseException]]:
+        """
+        并发获取多个视频的字幕
+
+        Args:
+            video_urls: B站视频URL列表
+
+        Returns:
+            与video_urls一一对应的结果：字幕文本、None（获取失败）或异常对象
+        """
+        semaphore = asyncio.Semaphore(self.BATCH_CONCURRENCY)
+
+        async def fetch(video_url: str) -> Optional[str]:
+            async with semaphore:
+                return await self.fetch_subtitle(video_url)
+
+        return await asyncio.gather(
+            *(fetch(video_url) for video_url in video_urls), return_exceptions=True
+        )
+
+    async def _warm_up_subtitle_cdn(self) -> None:
+        """向字幕CDN发送HEAD请求，让共享会话提前建立好可复用的连接"""
+        try:
+            session = await get_session()
+            async with session.head(
+                SUBTITLE_CDN_URL,
+                allow_redirects=False,
+                timeout=aiohttp.ClientTimeout(total=5),
+            ):
+                pass
+        except Exception as e:
+            self.logger.debug("预热字幕CDN连接失败: %s", e)
 
     async def _download_subtitle(self, subtitle_url: str) -> Optional[str]:
         """
@@ -153,38 +295,137 @@ class SubtitleFetcher:
             合并后的纯文本字幕
         """
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    subtitle_url, timeout=aiohttp.ClientTimeout(total=30)
-                ) as resp:
+            raw = await self._fetch_subtitle_bytes(subtitle_url)
+            if raw is None:
+                return None
+
+            # 解析字幕内容并合并文本，大文件交给线程池处理
+            try:
+                if len(raw) > PARSE_IN_THREAD_THRESHOLD:
+                    loop = asyncio.get_running_loop()
+                    return await loop.run_in_executor(
+                        THREAD_POOL, self._parse_subtitle_body, raw
+                    )
+                return self._parse_subtitle_body(raw)
+            except ValueError as e:
+                self.logger.error("解析字幕失败: %s", e)
+                return None
+
+        except Exception as e:
+            self.logger.error("下载字幕失败: %s", e)
+            return None
+
+    async def _fetch_subtitle_bytes(self, subtitle_url: str) -> Optional[bytes]:
+        """
+        下载字幕文件内容，遇到5xx或连接错误时退避后重试
+
+        Args:
+            subtitle_url: 字幕文件URL
+
+        Returns:
+            字幕文件原始内容，失败返回None
+        """
+        session = await get_session()
+        for attempt in range(DOWNLOAD_RETRIES + 1):
+            if attempt:
+                await asyncio.sleep(RETRY_BACKOFF * 2 ** (attempt - 1))
+            retryable = attempt < DOWNLOAD_RETRIES
+            try:
+                async with session.get(subtitle_url, timeout=_DEFAULT_TIMEOUT) as resp:
+                    if resp.status >= 500 and retryable:
+                        self.logger.warning("下载字幕失败，状态码: %s，准备重试", resp.status)
+                        continue
                     if resp.status != 200:
-                        self.logger.error(f"下载字幕失败，状态码: {resp.status}")
+                        self.logger.error("下载字幕失败，状态码: %s", resp.status)
                         return None
 
-                    subtitle_data = await resp.json()
+                    raw = await self._read_limited(resp, MAX_SUBTITLE_BYTES)
+                    if raw is None:
+                        self.logger.error("字幕文件超过 %s 字节上限，放弃下载", MAX_SUBTITLE_BYTES)
+                    return raw
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if not retryable:
+                    raise
+                self.logger.warning("下载字幕连接失败: %s，准备重试", e)
+        return None
+
+    @staticmethod
+    async def _read_limited(
+        resp: aiohttp.ClientResponse, max_bytes: int
+    ) -> Optional[bytes]:
+        """
+        分块读取响应体，超过大小上限时提前中止
 
-            # 解析字幕内容
-            if "body" not in subtitle_data:
-                self.logger.error("字幕数据格式错误，缺少body字段")
-                return None
+        Args:
+            resp: HTTP响应
+            max_bytes: 允许的最大字节数
 
-            body = subtitle_data["body"]
-            if not isinstance(body, list):
-                self.logger.error("字幕body不是列表格式")
+        Returns:
+            响应体内容，超过上限时返回None
+        """
+        if resp.content_length is not None and resp.content_length > max_bytes:
+            return None
+
+        buffer = bytearray()
+        async for chunk in resp.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+            buffer += chunk
+            if len(buffer) > max_bytes:
                 return None
+        return bytes(buffer)
 
-            # 提取所有字幕文本并合并
-            texts = []
-            for item in body:
-                if isinstance(item, dict) and "content" in item:
-                    content = item["content"].strip()
-                    if content:
-                        texts.append(content)
+    @classmethod
+    def _parse_subtitle_body(cls, raw: bytes) -> str:
+        """
+        解析字幕JSON并合并为纯文本（同步执行，可放入线程池）
 
-            # 合并文本
-            full_text = " ".join(texts)
-            return full_text
+        Args:
+            raw: 字幕JSON原始内容
 
-        except Exception as e:
-            self.logger.error(f"下载字幕失败: {e}")
-            return None
+        Returns:
+            合并后的纯文本字幕
+
+        Raises:
+            ValueError: 字幕数据格式错误
+        """
+        # JSON解析器返回的content已经是str，直接用str.join一次性拼接；
+        # 逐条encode写入bytearray再整体decode反而多一轮编解码，实测更慢
+        return " ".join(cls._extract_subtitle_texts(raw))
+
+    @staticmethod
+    def _extract_subtitle_texts(raw: bytes) -> List[str]:
+        """
+        从字幕JSON中提取所有非空的字幕文本
+
+        安装了pysimdjson时按需解析，只读取content字段，
+        不为from/to/sid等字段创建Python对象；否则完整解析JSON
+
+        Args:
+            raw: 字幕JSON原始内容
+
+        Returns:
+            按时间顺序排列的字幕文本列表
+
+        Raises:
+            ValueError: 字幕数据格式错误
+        """
+        if simdjson is not None:
+            subtitle_data = simdjson.Parser().parse(raw)
+            object_type, array_type = simdjson.Object, simdjson.Array
+        else:
+            subtitle_data = json_utils.loads(raw)
+            object_type, array_type = dict, list
+
+        if not isinstance(subtitle_data, object_type) or "body" not in subtitle_data:
+            raise ValueError("字幕数据格式错误，缺少body字段")
+
+        body = subtitle_data["body"]
+        if not isinstance(body, array_type):
+            raise ValueError("字幕body不是列表格式")
+
+        texts = []
+        for item in body:
+            if isinstance(item, object_type) and "content" in item:
+                content = item["content"].strip()
+                if content:
+                    texts.append(content)
+        return texts
@@ -5,12 +5,45 @@
 使用AI大模型和精心设计的提示词生成高质量的视频总结
 """
 
+import asyncio
+import hashlib
+import json
 import logging
-from typing import Optional
+import os
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
 
 from .ai_client import AIClient
 
 
+def _compact(text: str) -> str:
+    """
+    压缩字幕文本：合并连续空白，并去掉与前一段完全相同的重复片段
+
+    字幕按空白分段（如连续的"嗯 嗯 嗯"或重复识别的同一句），
+    单次遍历即可完成，减少发送给AI的无效字符
+
+    Args:
+        text: 原始字幕文本
+
+    Returns:
+        压缩后的字幕文本
+    """
+    segments = []
+    previous = None
+    for segment in text.split():
+        if segment != previous:
+            segments.append(segment)
+            previous = segment
+    return " ".join(segments)
+
+
 class SummaryGenerator:
     """视频总结生成器"""
 
@@ -92,16 +125,61 @@ class SummaryGenerator:
 
 请开始总结："""
 
-    def __init__(self, ai_client: AIClient):
+    # 模板只有{subtitle}一个占位符，预先拆成前后两段，拼接时无需再解析格式串
+    _USER_PROMPT_PREFIX, _, _USER_PROMPT_SUFFIX = USER_PROMPT_TEMPLATE.partition(
+        "{subtitle}"
+    )
+
+    # 批量总结提示词：复用单视频的格式要求，要求按JSON数组逐个输出
+    BATCH_USER_PROMPT_TEMPLATE = (
+        USER_PROMPT_TEMPLATE.split("**视频字幕内容：**")[0].rstrip()
+        + """
+
+## 📦 批量输出要求
+下面共有 {count} 个视频的字幕，请分别为每个视频生成一份符合上述格式的总结。
+以JSON对象输出：{{"summaries": ["视频1的总结", "视频2的总结", ...]}}
+- summaries 数组长度必须为 {count}，顺序与视频编号一致
+- 每个元素是对应视频的完整Markdown总结字符串
+
+{subtitles}
+
+请开始总结："""
+    )
+
+    # 单个视频字幕的最大长度（约10000个token）
+    MAX_SUBTITLE_LENGTH = 30000
+
+    # 单个视频总结的最大输出token数
+    MAX_SUMMARY_TOKENS = 3000
+
+    # 单次请求的输出token上限（各服务商不同，如deepseek-chat为8192）
+    DEFAULT_MAX_OUTPUT_TOKENS = 8192
+
+    # 总结缓存：相同模型+相同提示词的总结结果直接复用，保留30天
+    SUMMARY_CACHE_DIR = Path("data/summary_cache")
+    SUMMARY_CACHE_TTL = 30 * 24 * 3600
+
+    # 清理过期缓存文件的最小间隔（大部分总结不会被再次读取，需在写入时顺带清理）
+    SUMMARY_CACHE_PRUNE_INTERVAL = 24 * 3600
+
+    def __init__(self, ai_client: AIClient, max_output_tokens: Optional[int] = None):
         """
         初始化总结生成器
 
         Args:
             ai_client: AI客户端实例
+            max_output_tokens: 单次请求的输出token上限（可选，不设置则使用默认值）
         """
         self.ai_client = ai_client
+        self.max_output_tokens = max_output_tokens or self.DEFAULT_MAX_OUTPUT_TOKENS
+        self._last_cache_prune = 0.0
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
 
+    @property
+    def max_batch_size(self) -> int:
+        """单次批量请求最多包含的视频数（保证输出不超过服务商的token上限）"""
+        return max(1, self.max_output_tokens // self.MAX_SUMMARY_TOKENS)
+
     async def generate_summary(self, subtitle: str) -> Optional[str]:
         """
         生成视频总结
@@ -113,48 +191,293 @@ class SummaryGenerator:
             Markdown格式的总结内容，失败返回None
         """
         try:
-            if not subtitle or len(subtitle.strip()) < 50:
-                self.logger.error("字幕内容太短，无法生成总结")
+            messages = self._build_summary_messages(subtitle)
+            if messages is None:
                 return None
 
-            self.logger.info(f"开始生成总结，字幕长度: {len(subtitle)} 字符")
-
-            # 如果字幕太长，需要截断（防止超过token限制）
-            max_subtitle_length = 30000  # 约10000个token
-            if len(subtitle) > max_subtitle_length:
-                self.logger.warning(
-                    f"字幕过长（{len(subtitle)}字符），将截断到{max_subtitle_length}字符"
-                )
-                subtitle = (
-                    subtitle[:max_subtitle_length] + "...\n[字幕因长度限制已截断]"
-                )
-
-            # 构建提示词
-            user_prompt = self.USER_PROMPT_TEMPLATE.format(subtitle=subtitle)
-
-            # 构建消息
-            messages = [
-                {"role": "system", "content": self.SYSTEM_PROMPT},
-                {"role": "user", "content": user_prompt},
-            ]
+            # 命中缓存时跳过AI调用
+            cache_key = self._summary_cache_key(messages)
+            cached = await asyncio.to_thread(self._read_cached_summary, cache_key)
+            if cached:
+                self.logger.info("使用缓存的总结，长度: %d 字符", len(cached))
+                return cached
 
             # 调用AI
             summary = await self.ai_client.chat_completion(
                 messages=messages,
                 temperature=0.7,  # 适中的创造性
-                max_tokens=3000,  # 增加输出长度以支持更详细的总结
+                max_tokens=self.MAX_SUMMARY_TOKENS,  # 增加输出长度以支持更详细的总结
             )
 
             if summary:
-                self.logger.info(f"总结生成成功，长度: {len(summary)} 字符")
+                self.logger.info("总结生成成功，长度: %d 字符", len(summary))
+                await asyncio.to_thread(self._write_cached_summary, cache_key, summary)
                 return summary
             else:
                 self.logger.error("AI返回的总结为空")
                 return None
 
         except Exception as e:
-            self.logger.error(f"生成总结失败: {e}", exc_info=True)
+            self.logger.error("生成总结失败: %s", e, exc_info=True)
+            return None
+
+    def _build_summary_messages(self, subtitle: str) -> Optional[List[dict]]:
+        """
+        构建单个视频总结的对话消息
+
+        Args:
+            subtitle: 视频字幕文本
+
+        Returns:
+            消息列表，字幕太短时返回None
+        """
+        subtitle = self._prepare_subtitle(subtitle)
+        if subtitle is None:
+            return None
+        return self._summary_messages(subtitle)
+
+    def _prepare_subtitle(self, subtitle: str) -> Optional[str]:
+        """
+        预处理字幕：去除重复片段和多余空白，过长时截断
+
+        Args:
+            subtitle: 视频字幕文本
+
+        Returns:
+            处理后的字幕，字幕太短时返回None
+        """
+        if not subtitle or len(subtitle.strip()) < 50:
+            self.logger.error("字幕内容太短，无法生成总结")
+            return None
+
+        self.logger.info("开始生成总结，字幕长度: %d 字符", len(subtitle))
+
+        # 去除重复片段和多余空白，减少无效的输入token
+        subtitle = _compact(subtitle)
+
+        # 如果字幕太长，需要截断（防止超过token限制）
+        return self._truncate_subtitle(subtitle)
+
+    def _summary_messages(self, subtitle: str) -> List[dict]:
+        """根据预处理后的字幕构建单个视频总结的对话消息"""
+        user_prompt = self._USER_PROMPT_PREFIX + subtitle + self._USER_PROMPT_SUFFIX
+        return [
+            {"role": "system", "content": self.SYSTEM_PROMPT},
+            {"role": "user", "content": user_prompt},
+        ]
+
+    def _summary_cache_key(self, messages: List[dict]) -> str:
+        """根据模型和提示词计算缓存键（安装了xxhash时使用更快的xxh3）"""
+        data = "\0".join(
+            [self.ai_client.model] + [m["content"] for m in messages]
+        ).encode("utf-8")
+        if xxhash is not None:
+            return xxhash.xxh3_128_hexdigest(data)
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+    def _read_cached_summary(self, cache_key: str) -> Optional[str]:
+        """读取未过期的缓存总结，不存在或已过期返回None"""
+        path = self.SUMMARY_CACHE_DIR / f"{cache_key}.md"
+        try:
+            if time.time() - path.stat().st_mtime > self.SUMMARY_CACHE_TTL:
+                path.unlink(missing_ok=True)
+                return None
+            return path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            self.logger.warning("读取总结缓存失败: %s", e)
+            return None
+
+    def _write_cached_summary(self, cache_key: str, summary: str) -> None:
+        """写入总结缓存（先写临时文件再原子替换）"""
+        path = self.SUMMARY_CACHE_DIR / f"{cache_key}.md"
+        try:
+            os.makedirs(self.SUMMARY_CACHE_DIR, exist_ok=True)
+            tmp_path = path.with_suffix(".md.tmp")
+            tmp_path.write_text(summary, encoding="utf-8")
+            os.replace(tmp_path, path)
+        except Exception as e:
+            self.logger.warning("保存总结缓存失败: %s", e)
+
+        now = time.time()
+        if now - self._last_cache_prune >= self.SUMMARY_CACHE_PRUNE_INTERVAL:
+            self._last_cache_prune = now
+            self._prune_cached_summaries(now)
+
+    def _prune_cached_summaries(self, now: float) -> None:
+        """删除已过期的缓存总结"""
+        removed = 0
+        try:
+            with os.scandir(self.SUMMARY_CACHE_DIR) as entries:
+                for entry in entries:
+                    if not entry.name.endswith(".md"):
+                        continue
+                    try:
+                        if now - entry.stat().st_mtime > self.SUMMARY_CACHE_TTL:
+                            os.unlink(entry.path)
+                            removed += 1
+                    except FileNotFoundError:
+                        continue
+        except Exception as e:
+            self.logger.warning("清理总结缓存失败: %s", e)
+        if removed:
+            self.logger.info("已清理 %d 个过期的总结缓存", removed)
+
+    async def generate_summaries_batch(
+        self, subtitles: List[str]
+    ) -> List[Optional[str]]:
+        """
+        在一次AI请求中为多个视频生成总结（摊薄每次请求的固定延迟）
+
+        已缓存的视频直接复用缓存；视频数超过max_batch_size时分多次请求
+
+        Args:
+            subtitles: 视频字幕文本列表
+
+        Returns:
+            与subtitles一一对应的总结列表，失败的项为None
+        """
+        if len(subtitles) <= 1:
+            return await self._generate_summaries_individually(subtitles)
+
+        results: List[Optional[str]] = [None] * len(subtitles)
+        try:
+            # 与单个总结使用相同的缓存键，批量和逐个生成的结果可互相复用
+            prepared = [self._prepare_subtitle(s) for s in subtitles]
+            cache_keys = [
+                self._summary_cache_key(self._summary_messages(p)) if p else None
+                for p in prepared
+            ]
+            cached = await asyncio.to_thread(self._read_cached_summaries, cache_keys)
+
+            pending = []
+            for i, (key, summary) in enumerate(zip(cache_keys, cached)):
+                if summary:
+                    results[i] = summary
+                elif key:
+                    pending.append(i)
+
+            if len(pending) < len(subtitles):
+                self.logger.info(
+                    "批量总结: %d 个使用缓存，%d 个需要生成",
+                    sum(1 for r in results if r),
+                    len(pending),
+                )
+
+            step = self.max_batch_size
+            for start in range(0, len(pending), step):
+                batch = pending[start : start + step]
+                summaries = await self._request_batch_summaries(
+                    [prepared[i] for i in batch]
+                )
+                if summaries is None:
+                    self.logger.warning("批量总结结果解析失败，改为逐个生成总结")
+                    summaries = await self._generate_summaries_individually(
+                        [subtitles[i] for i in batch]
+                    )
+                else:
+                    await asyncio.to_thread(
+                        self._write_cached_summaries,
+                        [(cache_keys[i], s) for i, s in zip(batch, summaries) if s],
+                    )
+                for i, summary in zip(batch, summaries):
+                    results[i] = summary
+
+            return results
+
+        except Exception as e:
+            self.logger.error("批量生成总结失败: %s", e, exc_info=True)
+            return results
+
+    async def _request_batch_summaries(
+        self, subtitles: List[str]
+    ) -> Optional[List[Optional[str]]]:
+        """
+        发送一次批量总结请求
+
+        Args:
+            subtitles: 预处理后的字幕列表
+
+        Returns:
+            与subtitles一一对应的总结列表，请求或解析失败时返回None
+        """
+        if len(subtitles) == 1:
+            summary = await self.ai_client.chat_completion(
+                messages=self._summary_messages(subtitles[0]),
+                temperature=0.7,
+                max_tokens=self.MAX_SUMMARY_TOKENS,
+            )
+            return [summary] if summary else None
+
+        self.logger.info("开始批量生成总结，共 %d 个视频", len(subtitles))
+
+        sections = [
+            f"### 视频{i}字幕\n{subtitle}" for i, subtitle in enumerate(subtitles, 1)
+        ]
+        user_prompt = self.BATCH_USER_PROMPT_TEMPLATE.format(
+            count=len(subtitles), subtitles="\n\n".join(sections)
+        )
+
+        messages = [
+            {"role": "system", "content": self.SYSTEM_PROMPT},
+            {"role": "user", "content": user_prompt},
+        ]
+
+        content = await self.ai_client.chat_completion(
+            messages=messages,
+            temperature=0.7,
+            max_tokens=min(
+                self.MAX_SUMMARY_TOKENS * len(subtitles), self.max_output_tokens
+            ),
+            response_format={"type": "json_object"},
+        )
+
+        summaries = self._parse_batch_summaries(content, len(subtitles))
+        if summaries is not None:
+            self.logger.info("批量总结生成成功，共 %d 个", len(summaries))
+        return summaries
+
+    def _read_cached_summaries(
+        self, cache_keys: List[Optional[str]]
+    ) -> List[Optional[str]]:
+        """批量读取缓存总结（在线程中执行，一次切换读取全部）"""
+        return [self._read_cached_summary(key) if key else None for key in cache_keys]
+
+    def _write_cached_summaries(self, entries: List[Tuple[str, str]]) -> None:
+        """批量写入缓存总结"""
+        for cache_key, summary in entries:
+            self._write_cached_summary(cache_key, summary)
+
+    async def _generate_summaries_individually(
+        self, subtitles: List[str]
+    ) -> List[Optional[str]]:
+        """逐个生成总结（批量请求不可用时的回退方案）"""
+        return [await self.generate_summary(subtitle) for subtitle in subtitles]
+
+    @staticmethod
+    def _parse_batch_summaries(
+        content: Optional[str], count: int
+    ) -> Optional[List[Optional[str]]]:
+        """解析批量总结返回的JSON，格式不符时返回None"""
+        if not content:
+            return None
+        try:
+            summaries = json.loads(content).get("summaries")
+        except (ValueError, AttributeError):
             return None
+        if not isinstance(summaries, list) or len(summaries) != count:
+            return None
+        return [s if isinstance(s, str) and s.strip() else None for s in summaries]
+
+    def _truncate_subtitle(self, subtitle: str) -> str:
+        """字幕过长时截断（防止超过token限制）"""
+        if len(subtitle) <= self.MAX_SUBTITLE_LENGTH:
+            return subtitle
+        self.logger.warning(
+            "字幕过长（%d字符），将截断到%s字符", len(subtitle), self.MAX_SUBTITLE_LENGTH
+        )
+        return subtitle[: self.MAX_SUBTITLE_LENGTH] + "...\n[字幕因长度限制已截断]"
 
     async def generate_short_summary(self, subtitle: str) -> Optional[str]:
         """
@@ -192,5 +515,5 @@ class SummaryGenerator:
             return summary
 
         except Exception as e:
-            self.logger.error(f"生成简短总结失败: {e}")
+            self.logger.error("生成简短总结失败: %s", e)
             return None
@@ -7,15 +7,42 @@ B站认证和Cookie管理模块
 """
 
 import asyncio
-import json
+import functools
 import logging
 import os
+import re
 import time
 from pathlib import Path
 from typing import Optional, Tuple
 
 import aiohttp
 
+from config import USER_AGENT, getenv
+from core import json_utils
+
+from .http_session import close_session, get_session
+
+# 匹配Cookie字符串中的bili_jct字段
+_BILI_JCT_RE = re.compile(r"(?:^|;)\s*bili_jct=([^;]*)")
+
+# 连接阶段快速失败，读取阶段单次等待不超过10秒
+_DEFAULT_TIMEOUT = aiohttp.ClientTimeout(
+    total=30, connect=3, sock_connect=3, sock_read=10
+)
+
+# 认证请求的公共请求头（各请求只需补充Cookie）
+_BASE_HEADERS_JSON = {"User-Agent": USER_AGENT}
+_BASE_HEADERS_FORM = {
+    "User-Agent": USER_AGENT,
+    "Content-Type": "application/x-www-form-urlencoded",
+}
+
+
+@functools.lru_cache(maxsize=32)
+def _cookie_field_pattern(name: str) -> "re.Pattern[str]":
+    """获取匹配Cookie字符串中指定字段的正则（按字段名缓存）"""
+    return re.compile(rf"(^|;\s*){re.escape(name)}=[^;]*")
+
 
 class BilibiliAuth:
     """B站认证管理类"""
@@ -36,25 +63,29 @@ class BilibiliAuth:
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
         self.auth_data = self._load_auth_data()
 
+        # 进行中的自动刷新流程，并发调用共享同一次结果
+        self._refresh_task: Optional["asyncio.Future[Optional[str]]"] = None
+
     def _load_auth_data(self) -> dict:
         """加载认证数据"""
         if self.AUTH_DATA_PATH.exists():
             try:
-                with open(self.AUTH_DATA_PATH, "r", encoding="utf-8") as f:
-                    return json.load(f)
+                return json_utils.loads(self.AUTH_DATA_PATH.read_bytes())
             except Exception as e:
-                self.logger.error(f"加载认证数据失败: {e}")
+                self.logger.error("加载认证数据失败: %s", e)
         return {}
 
     def _save_auth_data(self) -> None:
         """保存认证数据"""
         try:
             os.makedirs(self.AUTH_DATA_PATH.parent, exist_ok=True)
-            with open(self.AUTH_DATA_PATH, "w", encoding="utf-8") as f:
-                json.dump(self.auth_data, f, ensure_ascii=False, indent=2)
+            # 先写临时文件再原子替换，避免写入中断导致认证数据损坏
+            tmp_path = self.AUTH_DATA_PATH.with_suffix(".json.tmp")
+            tmp_path.write_bytes(json_utils.dumps(self.auth_data, indent=True))
+            os.replace(tmp_path, self.AUTH_DATA_PATH)
             self.logger.info("认证数据已保存")
         except Exception as e:
-            self.logger.error(f"保存认证数据失败: {e}")
+            self.logger.error("保存认证数据失败: %s", e)
 
     def set_refresh_token(self, refresh_token: str) -> None:
         """
@@ -74,9 +105,7 @@ class BilibiliAuth:
         优先从.env读取，如果没有则从auth_data读取
         """
         # 优先从环境变量读取（.env文件）
-        import os
-
-        env_refresh_token = os.getenv("refresh_token")
+        env_refresh_token = getenv("refresh_token")
         if env_refresh_token:
             return env_refresh_token
 
@@ -101,36 +130,35 @@ class BilibiliAuth:
             if csrf:
                 params["csrf"] = csrf
 
-            # 导入统一配置的User-Agent
-            from config import USER_AGENT
-
-            headers = {
-                "User-Agent": USER_AGENT,
-                "Cookie": cookie,
-            }
-
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    self.CHECK_COOKIE_URL, params=params, headers=headers, timeout=10
-                ) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        if data.get("code") == 0:
-                            result = data.get("data", {})
-                            need_refresh = result.get("refresh", False)
-                            timestamp = result.get("timestamp")
-
-                            self.logger.info(
-                                f"Cookie检查完成: need_refresh={need_refresh}, timestamp={timestamp}"
-                            )
-                            return need_refresh, timestamp
-                        else:
-                            self.logger.error(f"检查Cookie失败: {data.get('message')}")
+            headers = {**_BASE_HEADERS_JSON, "Cookie": cookie}
+
+            session = await get_session()
+            async with session.get(
+                self.CHECK_COOKIE_URL,
+                params=params,
+                headers=headers,
+                timeout=_DEFAULT_TIMEOUT,
+            ) as resp:
+                if resp.status == 200:
+                    data = json_utils.loads(await resp.read())
+                    if data.get("code") == 0:
+                        result = data.get("data", {})
+                        need_refresh = result.get("refresh", False)
+                        timestamp = result.get("timestamp")
+
+                        self.logger.info(
+                            "Cookie检查完成: need_refresh=%s, timestamp=%s",
+                            need_refresh,
+                            timestamp,
+                        )
+                        return need_refresh, timestamp
                     else:
-                        self.logger.error(f"检查Cookie失败，HTTP状态码: {resp.status}")
+                        self.logger.error("检查Cookie失败: %s", data.get("message"))
+                else:
+                    self.logger.error("检查Cookie失败，HTTP状态码: %s", resp.status)
 
         except Exception as e:
-            self.logger.error(f"检查Cookie时出错: {e}")
+            self.logger.error("检查Cookie时出错: %s", e)
 
         return False, None
 
@@ -167,39 +195,33 @@ class BilibiliAuth:
                 "source": "main_web",
             }
 
-            # 导入统一配置的User-Agent
-            from config import USER_AGENT
-
-            headers = {
-                "User-Agent": USER_AGENT,
-                "Cookie": old_cookie,
-                "Content-Type": "application/x-www-form-urlencoded",
-            }
-
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    self.REFRESH_COOKIE_URL, data=data, headers=headers, timeout=10
-                ) as resp:
-                    if resp.status == 200:
-                        result = await resp.json()
-                        if result.get("code") == 0:
-                            data = result.get("data", {})
-                            new_refresh_token = data.get("refresh_token")
-
-                            # 从响应头中获取新Cookie
-                            new_cookie = self._merge_cookies(old_cookie, resp.cookies)
-
-                            self.logger.info("Cookie刷新成功")
-                            return new_cookie, new_refresh_token
-                        else:
-                            self.logger.error(
-                                f"刷新Cookie失败: {result.get('message')}"
-                            )
+            headers = {**_BASE_HEADERS_FORM, "Cookie": old_cookie}
+
+            session = await get_session()
+            async with session.post(
+                self.REFRESH_COOKIE_URL,
+                data=data,
+                headers=headers,
+                timeout=_DEFAULT_TIMEOUT,
+            ) as resp:
+                if resp.status == 200:
+                    result = json_utils.loads(await resp.read())
+                    if result.get("code") == 0:
+                        data = result.get("data", {})
+                        new_refresh_token = data.get("refresh_token")
+
+                        # 从响应头中获取新Cookie
+                        new_cookie = self._merge_cookies(old_cookie, resp.cookies)
+
+                        self.logger.info("Cookie刷新成功")
+                        return new_cookie, new_refresh_token
                     else:
-                        self.logger.error(f"刷新Cookie失败，HTTP状态码: {resp.status}")
+                        self.logger.error("刷新Cookie失败: %s", result.get("message"))
+                else:
+                    self.logger.error("刷新Cookie失败，HTTP状态码: %s", resp.status)
 
         except Exception as e:
-            self.logger.error(f"刷新Cookie时出错: {e}")
+            self.logger.error("刷新Cookie时出错: %s", e)
 
         return None
 
@@ -225,31 +247,27 @@ class BilibiliAuth:
                 "refresh_token": old_refresh_token,
             }
 
-            # 导入统一配置的User-Agent
-            from config import USER_AGENT
-
-            headers = {
-                "User-Agent": USER_AGENT,
-                "Cookie": new_cookie,
-                "Content-Type": "application/x-www-form-urlencoded",
-            }
-
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    self.CONFIRM_REFRESH_URL, data=data, headers=headers, timeout=10
-                ) as resp:
-                    if resp.status == 200:
-                        result = await resp.json()
-                        if result.get("code") == 0:
-                            self.logger.info("确认Cookie刷新成功")
-                            return True
-                        else:
-                            self.logger.error(f"确认刷新失败: {result.get('message')}")
+            headers = {**_BASE_HEADERS_FORM, "Cookie": new_cookie}
+
+            session = await get_session()
+            async with session.post(
+                self.CONFIRM_REFRESH_URL,
+                data=data,
+                headers=headers,
+                timeout=_DEFAULT_TIMEOUT,
+            ) as resp:
+                if resp.status == 200:
+                    result = json_utils.loads(await resp.read())
+                    if result.get("code") == 0:
+                        self.logger.info("确认Cookie刷新成功")
+                        return True
                     else:
-                        self.logger.error(f"确认刷新失败，HTTP状态码: {resp.status}")
+                        self.logger.error("确认刷新失败: %s", result.get("message"))
+                else:
+                    self.logger.error("确认刷新失败，HTTP状态码: %s", resp.status)
 
         except Exception as e:
-            self.logger.error(f"确认刷新时出错: {e}")
+            self.logger.error("确认刷新时出错: %s", e)
 
         return False
 
@@ -257,12 +275,30 @@ class BilibiliAuth:
         """
         自动检查并刷新Cookie（如果需要）
 
+        refresh_token在首次刷新成功后即失效，并发调用只执行一次刷新流程，
+        其余调用等待并共享同一结果
+
         Args:
             current_cookie: 当前Cookie
 
         Returns:
             新Cookie（如果刷新了）或原Cookie
         """
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.ensure_future(
+                self._auto_refresh(current_cookie)
+            )
+            self._refresh_task.add_done_callback(self._clear_refresh_task)
+        # 单个调用方被取消时不影响其他等待者
+        return await asyncio.shield(self._refresh_task)
+
+    def _clear_refresh_task(self, task: "asyncio.Future[Optional[str]]") -> None:
+        """刷新流程结束后清除记录，下次调用重新检查"""
+        if self._refresh_task is task:
+            self._refresh_task = None
+
+    async def _auto_refresh(self, current_cookie: str) -> Optional[str]:
+        """自动检查并刷新Cookie的实际流程"""
         try:
             # 检查今天是否已经检查过
             last_check = self.auth_data.get("last_check_time", 0)
@@ -276,11 +312,11 @@ class BilibiliAuth:
             # 检查是否需要刷新
             need_refresh, timestamp = await self.check_need_refresh(current_cookie)
 
-            # 更新检查时间
+            # 更新检查时间（需要刷新时随新的refresh_token一并保存，只写一次文件）
             self.auth_data["last_check_time"] = current_time
-            self._save_auth_data()
 
             if not need_refresh:
+                self._save_auth_data()
                 self.logger.info("Cookie无需刷新")
                 return current_cookie
 
@@ -294,6 +330,7 @@ class BilibiliAuth:
             refresh_result = await self.refresh_cookie(current_cookie, correspond_path)
             if not refresh_result:
                 self.logger.error("Cookie刷新失败")
+                self._save_auth_data()
                 return current_cookie
 
             new_cookie, new_refresh_token = refresh_result
@@ -314,35 +351,32 @@ class BilibiliAuth:
             return new_cookie
 
         except Exception as e:
-            self.logger.error(f"自动刷新Cookie时出错: {e}")
+            self.logger.error("自动刷新Cookie时出错: %s", e)
             return current_cookie
 
     @staticmethod
     def _extract_bili_jct(cookie: str) -> Optional[str]:
         """从Cookie字符串中提取bili_jct"""
-        for item in cookie.split(";"):
-            item = item.strip()
-            if item.startswith("bili_jct="):
-                return item.split("=", 1)[1]
-        return None
+        match = _BILI_JCT_RE.search(cookie)
+        return match.group(1).strip() if match else None
 
     @staticmethod
     def _merge_cookies(old_cookie: str, new_cookies) -> str:
-        """合并旧Cookie和新Cookie"""
-        # 解析旧Cookie
-        cookie_dict = {}
-        for item in old_cookie.split(";"):
-            item = item.strip()
-            if "=" in item:
-                key, value = item.split("=", 1)
-                cookie_dict[key] = value
-
-        # 更新新Cookie
-        for key, morsel in new_cookies.items():
-            cookie_dict[key] = morsel.value
+        """
+        合并旧Cookie和新Cookie
 
-        # 重新组装
-        return "; ".join([f"{k}={v}" for k, v in cookie_dict.items()])
+        只替换发生变化的字段（通常只有SESSDATA、bili_jct等少数几个），
+        其余部分保持原样，无需拆分重组整个Cookie字符串
+        """
+        merged = old_cookie.strip().rstrip(";")
+        for key, morsel in new_cookies.items():
+            item = f"{key}={morsel.value}"
+            merged, count = _cookie_field_pattern(key).subn(
+                lambda m: m.group(1) + item, merged, count=1
+            )
+            if not count:
+                merged = f"{merged}; {item}" if merged else item
+        return merged
 
     @staticmethod
     def _generate_correspond_path(timestamp: Optional[int] = None) -> str:
@@ -363,7 +397,7 @@ class BilibiliAuth:
 
         # 简化版本：使用时间戳的十六进制
         # 实际应该调用wasm算法
-        return hex(timestamp)[2:]
+        return format(timestamp, "x")
 
 
 # 使用示例
@@ -378,6 +412,7 @@ async def example_usage():
 
     # 2. 自动检查并刷新（如果需要）
     new_cookie = await auth.auto_refresh_if_needed(current_cookie)
+    await close_session()
 
     if new_cookie != current_cookie:
         print("Cookie已更新！")
@@ -10,23 +10,63 @@ B站视频评论获取服务
 """
 
 import asyncio
+import functools
+import heapq
 import logging
-from datetime import datetime
-from typing import Any, Dict, List, Optional
-
-try:
-    from bilibili_api import Credential, comment, video
-    from bilibili_api.comment import CommentResourceType, OrderType
-except ImportError:
+import time
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    List,
+    Optional,
+    Tuple,
+)
+
+from core.lazy_import import import_module, module_available
+
+# bilibili-api导入较慢，这里只检查是否安装，首次请求评论时才导入
+if not module_available("bilibili_api"):
     raise ImportError(
         "请安装 bilibili-api-python: pip install bilibili-api-python 或 uv add bilibili-api-python"
     )
 
+if TYPE_CHECKING:
+    from bilibili_api import Credential
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+@functools.lru_cache(maxsize=4096)
+def _format_timestamp(timestamp: int) -> str:
+    """格式化时间戳为本地时间字符串（按时间戳缓存，无需构造datetime对象）"""
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(timestamp))
+
 
 class CommentFetcher:
     """B站评论获取服务"""
 
-    def __init__(self, credential: Optional[Credential] = None):
+    # 支持的筛选模式（见_filter_comments方法的说明）
+    FILTER_MODES = frozenset(
+        {
+            "all",
+            "any",
+            "keywords_only",
+            "users_only",
+            "keywords_or_users",
+            "keywords_and_users",
+        }
+    )
+
+    # 评论缓存有效期（秒），期间同一视频的重复请求直接复用结果
+    COMMENT_CACHE_TTL = 120
+
+    def __init__(self, credential: Optional["Credential"] = None):
         """
         初始化评论获取服务
 
@@ -36,11 +76,19 @@ class CommentFetcher:
         self.credential = credential
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
 
+        # (bvid, 页数) -> (获取时间, 评论列表)
+        self._comment_cache: Dict[
+            Tuple[str, int], Tuple[float, List[Dict[str, Any]]]
+        ] = {}
+        # (bvid, 页数) -> 锁，保证同一视频的并发请求只触发一次实际获取
+        self._fetch_locks: Dict[Tuple[str, int], asyncio.Lock] = {}
+
     async def fetch_hot_comments_with_rules(
         self,
         bvid: str,
         rules: List[Dict[str, Any]],
         max_count: int = 20,
+        pages: int = 1,
     ) -> List[Dict[str, Any]]:
         """
         使用多个规则获取评论（支持为同一视频应用多个筛选规则）
@@ -54,21 +102,21 @@ class CommentFetcher:
                 - min_likes: 最低点赞数
                 - filter_mode: 筛选模式
             max_count: 最多返回的评论总数
+            pages: 获取的评论页数（多页并发请求）
 
         Returns:
             所有规则筛选结果的并集（去重后）
         """
         try:
             # 首先获取所有评论（只获取一次）
-            all_comments = await self._fetch_all_hot_comments(bvid)
+            all_comments = await self._fetch_all_hot_comments(bvid, pages)
 
             if not all_comments:
                 self.logger.info(f"视频 {bvid} 没有评论")
                 return []
 
             # 存储所有规则的结果
-            all_results = []
-            seen_rpids = set()
+            matched = []
 
             # 应用每个规则
             for idx, rule in enumerate(rules, 1):
@@ -90,20 +138,22 @@ class CommentFetcher:
                     filter_mode=rule.get("filter_mode", "all"),
                 )
 
-                # 去重并添加到结果
-                for comm in filtered:
-                    rpid = comm.get("rpid")
-                    if rpid and rpid not in seen_rpids:
-                        seen_rpids.add(rpid)
-                        all_results.append(comm)
+                matched.extend(filtered)
 
                 self.logger.info(f"规则 '{rule_name}' 匹配 {len(filtered)} 条评论")
 
-            # 按点赞数排序
-            all_results.sort(key=lambda x: x.get("like", 0), reverse=True)
+            # 去重
+            all_results = self._dedup_by_rpid(matched)
 
-            # 限制返回数量
-            result = all_results[:max_count]
+            # 按点赞数取前max_count条（只需部分排序）
+            if max_count < len(all_results):
+                result = heapq.nlargest(
+                    max_count, all_results, key=lambda x: x.get("like", 0)
+                )
+            else:
+                result = sorted(
+                    all_results, key=lambda x: x.get("like", 0), reverse=True
+                )
 
             self.logger.info(
                 f"多规则筛选完成：{len(rules)}个规则，共找到{len(all_results)}条评论（去重后），返回前{len(result)}条"
@@ -115,17 +165,87 @@ class CommentFetcher:
             self.logger.error(f"多规则评论获取失败: {e}", exc_info=True)
             return []
 
-    async def _fetch_all_hot_comments(self, bvid: str) -> List[Dict[str, Any]]:
+    async def _fetch_all_hot_comments(
+        self, bvid: str, pages: int = 1
+    ) -> List[Dict[str, Any]]:
         """
-        获取视频的所有热门评论（不进行筛选）
+        获取视频的所有热门评论（带短期缓存）
+
+        缓存有效期内直接返回缓存结果；同一视频的并发请求会合并为一次获取
 
         Args:
             bvid: 视频的BV号
+            pages: 获取的评论页数
+
+        Returns:
+            原始评论列表
+        """
+        key = (bvid, pages)
+        cached = self._get_cached_comments(key)
+        if cached is not None:
+            return cached
+
+        lock = self._fetch_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            # 等待锁期间其他请求可能已经获取完成
+            cached = self._get_cached_comments(key)
+            if cached is not None:
+                return cached
+
+            comments = await self._fetch_hot_comments_from_api(bvid, pages)
+            if comments:
+                self._store_cached_comments(key, comments)
+            return list(comments)
+
+    def _get_cached_comments(
+        self, key: Tuple[str, int]
+    ) -> Optional[List[Dict[str, Any]]]:
+        """读取未过期的评论缓存，返回副本"""
+        entry = self._comment_cache.get(key)
+        if entry is None:
+            return None
+        fetched_at, comments = entry
+        if time.monotonic() - fetched_at >= self.COMMENT_CACHE_TTL:
+            return None
+        self.logger.debug("使用缓存的视频评论: %s (%d页)", *key)
+        return list(comments)
+
+    def _store_cached_comments(
+        self, key: Tuple[str, int], comments: List[Dict[str, Any]]
+    ) -> None:
+        """写入评论缓存，并清理已过期的条目"""
+        now = time.monotonic()
+        expired = [
+            cache_key
+            for cache_key, (fetched_at, _) in self._comment_cache.items()
+            if now - fetched_at >= self.COMMENT_CACHE_TTL
+        ]
+        for expired_key in expired:
+            del self._comment_cache[expired_key]
+            lock = self._fetch_locks.get(expired_key)
+            if lock is not None and not lock.locked():
+                del self._fetch_locks[expired_key]
+        self._comment_cache[key] = (now, comments)
+
+    async def _fetch_hot_comments_from_api(
+        self, bvid: str, pages: int = 1
+    ) -> List[Dict[str, Any]]:
+        """
+        从B站接口获取视频的所有热门评论（不进行筛选）
+
+        多页时并发请求第1~pages页，再合并各页结果
+
+        Args:
+            bvid: 视频的BV号
+            pages: 获取的评论页数
 
         Returns:
             原始评论列表
         """
         try:
+            video = import_module("bilibili_api.video")
+            comment = import_module("bilibili_api.comment")
+
             # 创建视频对象
             v = video.Video(bvid=bvid, credential=self.credential)
 
@@ -135,44 +255,64 @@ class CommentFetcher:
 
             self.logger.info(f"获取视频 {bvid} (aid={aid}) 的评论")
 
-            # 获取评论（按热度排序）
-            comment_data = await comment.get_comments(
-                oid=aid,
-                type_=CommentResourceType.VIDEO,
-                page_index=1,
-                order=OrderType.LIKE,  # 按热度排序
+            # 获取评论（按热度排序），各页并发请求
+            page_results = await asyncio.gather(
+                *(
+                    comment.get_comments(
+                        oid=aid,
+                        type_=comment.CommentResourceType.VIDEO,
+                        page_index=page_index,
+                        order=comment.OrderType.LIKE,  # 按热度排序
+                    )
+                    for page_index in range(1, max(pages, 1) + 1)
+                ),
+                return_exceptions=True,
             )
 
             all_comments = []
+            all_replies = []
 
-            # 1. 优先获取热门评论区（hots）
-            if "hots" in comment_data and comment_data["hots"]:
-                all_comments.extend(comment_data["hots"])
+            for page_index, comment_data in enumerate(page_results, 1):
+                if isinstance(comment_data, BaseException):
+                    self.logger.warning(
+                        "获取视频 %s 第%d页评论失败: %s", bvid, page_index, comment_data
+                    )
+                    continue
 
-            # 2. 获取UP主置顶评论
-            if "upper" in comment_data and comment_data["upper"]:
-                if "top" in comment_data["upper"] and comment_data["upper"]["top"]:
-                    all_comments.insert(0, comment_data["upper"]["top"])
+                # 1. 优先获取热门评论区（hots）
+                hots = comment_data.get("hots")
+                if hots:
+                    all_comments.extend(hots)
 
-            # 3. 获取普通评论列表
-            if "replies" in comment_data and comment_data["replies"]:
-                all_comments.extend(comment_data["replies"])
+                # 2. 获取UP主置顶评论
+                upper_top = (comment_data.get("upper") or {}).get("top")
+                if upper_top:
+                    all_comments.insert(0, upper_top)
 
-            # 去重
-            seen_rpids = set()
-            unique_comments = []
-            for comm in all_comments:
-                rpid = comm.get("rpid")
-                if rpid and rpid not in seen_rpids:
-                    seen_rpids.add(rpid)
-                    unique_comments.append(comm)
+                # 3. 获取普通评论列表
+                replies = comment_data.get("replies")
+                if replies:
+                    all_replies.extend(replies)
+
+            all_comments.extend(all_replies)
 
-            return unique_comments
+            # 去重
+            return self._dedup_by_rpid(all_comments)
 
         except Exception as e:
             self.logger.error(f"获取评论失败: {e}", exc_info=True)
             return []
 
+    @staticmethod
+    def _dedup_by_rpid(comments: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """按rpid去重（保留首次出现的评论和原有顺序），丢弃没有rpid的评论"""
+        unique: Dict[int, Dict[str, Any]] = {}
+        for comm in comments:
+            rpid = comm.get("rpid")
+            if rpid:
+                unique.setdefault(rpid, comm)
+        return list(unique.values())
+
     async def fetch_hot_comments(
         self,
         bvid: str,
@@ -182,6 +322,7 @@ class CommentFetcher:
         target_usernames: Optional[List[str]] = None,
         min_likes: Optional[int] = None,
         filter_mode: str = "all",
+        pages: int = 1,
     ) -> List[Dict[str, Any]]:
         """
         获取视频的热门评论并进行筛选（单规则模式）
@@ -194,13 +335,14 @@ class CommentFetcher:
             target_usernames: 目标用户名列表（支持用户名筛选）
             min_likes: 最低点赞数阈值
             filter_mode: 筛选模式（见_filter_comments方法的说明）
+            pages: 获取的评论页数（多页并发请求）
 
         Returns:
             筛选后的评论列表
         """
         try:
             # 获取所有评论
-            all_comments = await self._fetch_all_hot_comments(bvid)
+            all_comments = await self._fetch_all_hot_comments(bvid, pages)
 
             if not all_comments:
                 return []
@@ -228,6 +370,53 @@ class CommentFetcher:
             self.logger.error(f"获取评论失败: {e}", exc_info=True)
             return []
 
+    async def fetch_hot_comments_for_videos(
+        self,
+        bvids: List[str],
+        max_count: int = 20,
+        keywords: Optional[List[str]] = None,
+        target_user_ids: Optional[List[int]] = None,
+        target_usernames: Optional[List[str]] = None,
+        min_likes: Optional[int] = None,
+        filter_mode: str = "all",
+        pages: int = 1,
+        max_concurrency: int = 16,
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        并发获取多个视频的热门评论并进行筛选（单规则模式）
+
+        Args:
+            bvids: 视频BV号列表
+            max_count: 每个视频最多返回的评论数量
+            keywords: 关键字列表（满足任一关键字即可）
+            target_user_ids: 目标用户UID列表
+            target_usernames: 目标用户名列表
+            min_likes: 最低点赞数阈值
+            filter_mode: 筛选模式（见_filter_comments方法的说明）
+            pages: 每个视频获取的评论页数
+            max_concurrency: 最大并发请求数
+
+        Returns:
+            BV号 -> 筛选后的评论列表
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def fetch(bvid: str) -> List[Dict[str, Any]]:
+            async with semaphore:
+                return await self.fetch_hot_comments(
+                    bvid,
+                    max_count=max_count,
+                    keywords=keywords,
+                    target_user_ids=target_user_ids,
+                    target_usernames=target_usernames,
+                    min_likes=min_likes,
+                    filter_mode=filter_mode,
+                    pages=pages,
+                )
+
+        results = await asyncio.gather(*(fetch(bvid) for bvid in bvids))
+        return dict(zip(bvids, results))
+
     def _filter_comments(
         self,
         comments: List[Dict[str, Any]],
@@ -257,155 +446,155 @@ class CommentFetcher:
         Returns:
             筛选后的评论列表
         """
-        filtered = []
-
-        for comm in comments:
-            # 提取评论信息
-            content_obj = comm.get("content", {})
-            message = content_obj.get("message", "")
-            member = comm.get("member", {})
-            mid = member.get("mid", 0)
-            uname = member.get("uname", "")
-            like_count = comm.get("like", 0)
+        # 关键字匹配器只构建一次，供所有评论复用
+        keyword_matcher = self._build_keyword_matcher(keywords)
 
-            # 检查各个条件
-            keyword_match = self._check_keyword_match(message, keywords)
-            user_match = self._check_user_match(
-                mid, uname, target_user_ids, target_usernames
-            )
-            likes_match = self._check_likes_match(like_count, min_likes)
-
-            # 根据筛选模式决定是否通过
-            should_include = self._evaluate_filter_mode(
-                filter_mode,
-                keyword_match,
-                user_match,
-                likes_match,
-                has_keywords=bool(keywords and keywords),
-                has_users=bool(
-                    (target_user_ids and target_user_ids)
-                    or (target_usernames and target_usernames)
-                ),
-                has_min_likes=min_likes is not None,
-            )
+        # 目标用户转为集合，成员判断为O(1)
+        uid_set = frozenset(target_user_ids) if target_user_ids else None
+        name_set = frozenset(target_usernames) if target_usernames else None
 
-            if should_include:
-                filtered.append(comm)
+        # 筛选模式和条件在循环外确定，循环内只执行组合好的判断函数
+        predicate = self._build_filter_predicate(
+            filter_mode, keyword_matcher, uid_set, name_set, min_likes
+        )
 
-        return filtered
+        # 没有任何生效的条件时，所有评论都通过，无需逐条判断
+        if predicate is None:
+            return list(comments)
 
-    @staticmethod
-    def _check_keyword_match(message: str, keywords: Optional[List[str]]) -> bool:
-        """检查是否匹配关键字"""
-        if not keywords or not keywords:
-            return True  # 没有设置关键字，视为匹配
-        return any(keyword in message for keyword in keywords)
+        return [comm for comm in comments if predicate(comm)]
 
-    @staticmethod
-    def _check_user_match(
-        mid: int,
-        uname: str,
-        target_user_ids: Optional[List[int]] = None,
-        target_usernames: Optional[List[str]] = None,
-    ) -> bool:
-        """检查是否匹配目标用户（支持UID和用户名）"""
-        # 没有设置任何用户筛选条件
-        if not (target_user_ids and target_user_ids) and not (
-            target_usernames and target_usernames
-        ):
-            return True
-
-        # 检查UID匹配
-        if target_user_ids and target_user_ids:
-            if mid in target_user_ids:
-                return True
-
-        # 检查用户名匹配
-        if target_usernames and target_usernames:
-            if uname in target_usernames:
-                return True
-
-        return False
-
-    @staticmethod
-    def _check_likes_match(like_count: int, min_likes: Optional[int]) -> bool:
-        """检查是否满足点赞数要求"""
-        if min_likes is None:
-            return True  # 没有设置点赞数要求，视为匹配
-        return like_count >= min_likes
-
-    def _evaluate_filter_mode(
+    def _build_filter_predicate(
         self,
         mode: str,
-        keyword_match: bool,
-        user_match: bool,
-        likes_match: bool,
-        has_keywords: bool,
-        has_users: bool,
-        has_min_likes: bool,
-    ) -> bool:
+        keyword_matcher: Optional[Callable[[str], bool]],
+        uid_set: Optional[FrozenSet[int]],
+        name_set: Optional[FrozenSet[str]],
+        min_likes: Optional[int],
+    ) -> Optional[Callable[[Dict[str, Any]], bool]]:
         """
-        根据筛选模式评估是否应该包含该评论
+        根据筛选模式和已设置的条件，构建单条评论的判断函数
+
+        未设置的条件视为满足，直接省略；点赞数是硬性要求，设置后任何模式都必须满足
 
         Args:
-            mode: 筛选模式
-            keyword_match: 是否匹配关键字
-            user_match: 是否匹配用户
-            likes_match: 是否满足点赞数
-            has_keywords: 是否设置了关键字条件
-            has_users: 是否设置了用户条件
-            has_min_likes: 是否设置了点赞数条件
+            mode: 筛选模式（见_filter_comments方法的说明）
+            keyword_matcher: 关键字匹配函数，未设置关键字时为None
+            uid_set: 目标用户UID集合
+            name_set: 目标用户名集合
+            min_likes: 最低点赞数
 
         Returns:
-            是否应该包含该评论
+            判断函数，评论应被包含时返回True；没有生效的条件时返回None
         """
-        # 点赞数是硬性要求，必须满足
-        if has_min_likes and not likes_match:
-            return False
+        has_keywords = keyword_matcher is not None
+        has_users = bool(uid_set or name_set)
+        has_min_likes = min_likes is not None
+
+        # B站返回的评论字段基本齐全，直接下标访问，缺字段时再回退到默认值
+        def keyword_match(comm: Dict[str, Any]) -> bool:
+            try:
+                message = comm["content"]["message"]
+            except KeyError:
+                message = ""
+            return keyword_matcher(message)
+
+        def user_match(comm: Dict[str, Any]) -> bool:
+            try:
+                member = comm["member"]
+                mid = member["mid"]
+                uname = member["uname"]
+            except KeyError:
+                member = comm.get("member", {})
+                mid = member.get("mid", 0)
+                uname = member.get("uname", "")
+            return (uid_set is not None and mid in uid_set) or (
+                name_set is not None and uname in name_set
+            )
 
-        # 根据模式评估
-        if mode == "all":
-            # 所有已设置的条件都必须满足
-            return keyword_match and user_match and likes_match
+        def keyword_or_user_match(comm: Dict[str, Any]) -> bool:
+            return keyword_match(comm) or user_match(comm)
+
+        def likes_match(comm: Dict[str, Any]) -> bool:
+            try:
+                return comm["like"] >= min_likes
+            except KeyError:
+                return 0 >= min_likes
 
-        elif mode == "any":
-            # 任一已设置的条件满足即可
-            conditions = []
+        if mode not in self.FILTER_MODES:
+            self.logger.warning(f"未知的筛选模式: {mode}，使用默认的'all'模式")
+            mode = "all"
+
+        # 除点赞数外必须满足的条件
+        checks: List[Callable[[Dict[str, Any]], bool]] = []
+        if mode in ("all", "keywords_and_users"):
+            # 所有已设置的条件都必须满足
             if has_keywords:
-                conditions.append(keyword_match)
+                checks.append(keyword_match)
             if has_users:
-                conditions.append(user_match)
-            if has_min_likes:
-                conditions.append(likes_match)
-            return any(conditions) if conditions else True
-
+                checks.append(user_match)
         elif mode == "keywords_only":
             # 只检查关键字（忽略用户条件）
-            return keyword_match and likes_match
-
+            if has_keywords:
+                checks.append(keyword_match)
         elif mode == "users_only":
             # 只检查用户（忽略关键字条件）
-            return user_match and likes_match
-
-        elif mode == "keywords_or_users":
-            # 关键字或用户任一满足即可（点赞数仍需满足）
+            if has_users:
+                checks.append(user_match)
+        elif mode == "keywords_or_users" or (mode == "any" and not has_min_likes):
+            # 关键字或用户任一满足即可
+            # "any"模式设置了点赞数时，点赞数满足即视为满足任一条件
             if has_keywords and has_users:
-                return (keyword_match or user_match) and likes_match
+                checks.append(keyword_or_user_match)
             elif has_keywords:
-                return keyword_match and likes_match
+                checks.append(keyword_match)
             elif has_users:
-                return user_match and likes_match
-            else:
-                return likes_match
+                checks.append(user_match)
 
-        elif mode == "keywords_and_users":
-            # 关键字和用户必须同时满足
-            return keyword_match and user_match and likes_match
+        # 点赞数判断开销最小，放在最前面
+        if has_min_likes:
+            checks.insert(0, likes_match)
 
-        else:
-            # 默认使用"all"模式
-            self.logger.warning(f"未知的筛选模式: {mode}，使用默认的'all'模式")
-            return keyword_match and user_match and likes_match
+        if not checks:
+            return None
+        if len(checks) == 1:
+            return checks[0]
+        if len(checks) == 2:
+            first, second = checks
+            return lambda comm: first(comm) and second(comm)
+        return lambda comm: all(check(comm) for check in checks)
+
+    @staticmethod
+    def _build_keyword_matcher(
+        keywords: Optional[List[str]],
+    ) -> Optional[Callable[[str], bool]]:
+        """
+        构建关键字匹配函数（包含任一关键字即匹配）
+
+        安装了pyahocorasick时构建Aho-Corasick自动机，每条评论只需扫描一遍；
+        否则逐个关键字做子串查找
+
+        Args:
+            keywords: 关键字列表
+
+        Returns:
+            匹配函数，没有设置关键字时返回None
+        """
+        if not keywords:
+            return None
+
+        # 空字符串是任何文本的子串
+        if "" in keywords:
+            return lambda message: True
+
+        if ahocorasick is not None:
+            automaton = ahocorasick.Automaton()
+            for keyword in keywords:
+                automaton.add_word(keyword, keyword)
+            automaton.make_automaton()
+            return lambda message: next(automaton.iter(message), None) is not None
+
+        return lambda message: any(keyword in message for keyword in keywords)
 
     def format_comment_for_display(self, comm: Dict[str, Any]) -> str:
         """
@@ -430,31 +619,34 @@ class CommentFetcher:
 
             # 评论时间
             ctime = comm.get("ctime", 0)
-            time_str = datetime.fromtimestamp(ctime).strftime("%Y-%m-%d %H:%M:%S")
+            time_str = _format_timestamp(ctime)
 
             # 楼层
             floor = comm.get("floor", 0)
 
-            # 格式化输出
-            result = f"👤 **{uname}**\n"
-            result += f"🕐 {time_str}\n"
-            result += f"👍 {like_count} 赞 | 💬 {reply_count} 回复"
+            # 格式化输出（先收集片段，最后一次性拼接）
+            parts = [
+                f"👤 **{uname}**\n",
+                f"🕐 {time_str}\n",
+                f"👍 {like_count} 赞 | 💬 {reply_count} 回复",
+            ]
             if floor:
-                result += f" | 🏢 {floor}楼"
-            result += f"\n\n{message}\n"
+                parts.append(f" | 🏢 {floor}楼")
+            parts.append(f"\n\n{message}\n")
 
             # 🆕 处理评论中的图片
             pictures = content_obj.get("pictures", [])
             if pictures:
-                result += f"\n📷 **图片 ({len(pictures)}张)**\n\n"
-                for idx, pic in enumerate(pictures, 1):
-                    img_src = pic.get("img_src", "")
-                    if img_src:
-                        # 输出Markdown格式的图片链接
-                        # 飞书会自动处理这些链接并上传
-                        result += f"![评论图片{idx}]({img_src})\n\n"
+                parts.append(f"\n📷 **图片 ({len(pictures)}张)**\n\n")
+                # 输出Markdown格式的图片链接
+                # 飞书会自动处理这些链接并上传
+                parts.extend(
+                    f"![评论图片{idx}]({pic['img_src']})\n\n"
+                    for idx, pic in enumerate(pictures, 1)
+                    if pic.get("img_src")
+                )
 
-            return result
+            return "".join(parts)
 
         except Exception as e:
             self.logger.error(f"格式化评论失败: {e}")
@@ -478,21 +670,24 @@ class CommentFetcher:
             return "未找到符合条件的评论"
 
         # 构建Markdown内容
-        md_content = f"## 📺 视频：{video_title}\n\n"
-        md_content += f"🔗 https://www.bilibili.com/video/{bvid}\n\n"
-        md_content += f"---\n\n"
-        md_content += f"### 🔥 精选评论 (共{len(comments)}条)\n\n"
-
+        parts = [
+            f"## 📺 视频：{video_title}\n\n",
+            f"🔗 https://www.bilibili.com/video/{bvid}\n\n",
+            "---\n\n",
+            f"### 🔥 精选评论 (共{len(comments)}条)\n\n",
+        ]
         for idx, comm in enumerate(comments, 1):
-            md_content += f"#### {idx}. {self.format_comment_for_display(comm)}\n"
-            md_content += "---\n\n"
+            parts.append(f"#### {idx}. {self.format_comment_for_display(comm)}\n")
+            parts.append("---\n\n")
 
-        return md_content
+        return "".join(parts)
 
 
 # 使用示例
 async def example_usage():
     """使用示例"""
+    from bilibili_api import Credential
+
     from config import BILIBILI_CONFIG
 
     # 创建凭证（bilibili-api-python会自动处理WBI签名！）
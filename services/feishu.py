@@ -6,40 +6,31 @@
 """
 
 import asyncio
-import json
+import io
 import logging
-import os
 import re
+import time
 from typing import Optional
 
-import aiohttp
-
 # 导入配置
 
 from config import FEISHU_CONFIG
+from core import json_utils
+from core.lazy_import import import_module, module_available
+
+from .http_session import get_session
+
+# lark-oapi导入较慢，这里只检查是否安装，首次调用SDK时才导入（见_load_lark）
+LARK_SDK_AVAILABLE = module_available("lark_oapi")
 
 
-try:
-    import lark_oapi as lark
-    from lark_oapi.api.im.v1 import (
-        CreateImageRequest,
-        CreateImageRequestBody,
-        CreateImageResponse,
-        CreateMessageRequest,
-        CreateMessageRequestBody,
-        CreateMessageResponse,
-    )
-
-    LARK_SDK_AVAILABLE = True
-except ImportError:
-    LARK_SDK_AVAILABLE = False
-    lark = None
-    CreateMessageRequest = None
-    CreateMessageRequestBody = None
-    CreateMessageResponse = None
-    CreateImageRequest = None
-    CreateImageRequestBody = None
-    CreateImageResponse = None
+# Markdown图片语法：![描述](链接)
+_IMAGE_RE = re.compile(r"!\[([^\]]*)\]\(([^)]+)\)")
+
+
+def _load_lark():
+    """按需导入lark-oapi，返回(lark模块, im.v1接口模块)"""
+    return import_module("lark_oapi"), import_module("lark_oapi.api.im.v1")
 
 
 class FeishuBot:
@@ -56,6 +47,9 @@ class FeishuBot:
     LEVEL_WARNING = "WARNING"
     LEVEL_ERROR = "ERROR"
 
+    # 转换Markdown图片时的最大并发上传数
+    IMAGE_UPLOAD_CONCURRENCY = 8
+
     # 级别对应的emoji
     LEVEL_EMOJI = {
         "INFO": "✅",
@@ -85,6 +79,22 @@ class FeishuBot:
         else:
             self.logger.info("飞书应用模式已配置")
 
+        # 飞书SDK客户端（首次使用时创建，之后复用）
+        self._lark_client = None
+
+    def _get_lark_client(self):
+        """获取飞书SDK客户端（首次调用时创建）"""
+        if self._lark_client is None:
+            lark, _ = _load_lark()
+            self._lark_client = (
+                lark.Client.builder()
+                .app_id(self.app_id)
+                .app_secret(self.app_secret)
+                .log_level(lark.LogLevel.ERROR)
+                .build()
+            )
+        return self._lark_client
+
     async def upload_image_to_feishu(self, image_url: str) -> Optional[str]:
         """
         上传图片到飞书并获取image key
@@ -99,59 +109,45 @@ class FeishuBot:
             return None
 
         try:
-            # 创建飞书客户端
-            client = (
-                lark.Client.builder()
-                .app_id(self.app_id)
-                .app_secret(self.app_secret)
-                .log_level(lark.LogLevel.ERROR)
+            client = self._get_lark_client()
+
+            # 下载图片（复用共享的HTTP会话）
+            session = await get_session()
+            async with session.get(image_url) as response:
+                if response.status != 200:
+                    self.logger.warning(
+                        f"下载图片失败: {image_url}, status: {response.status}"
+                    )
+                    return None
+
+                image_data = await response.read()
+
+            # 直接从内存上传图片，无需写入临时文件
+            image_file = io.BytesIO(image_data)
+            image_file.name = "image.jpg"
+
+            _, im_v1 = _load_lark()
+            request = (
+                im_v1.CreateImageRequest.builder()
+                .request_body(
+                    im_v1.CreateImageRequestBody.builder()
+                    .image_type("message")
+                    .image(image_file)
+                    .build()
+                )
                 .build()
             )
 
-            # 下载图片
-            async with aiohttp.ClientSession() as session:
-                async with session.get(image_url) as response:
-                    if response.status != 200:
-                        self.logger.warning(
-                            f"下载图片失败: {image_url}, status: {response.status}"
-                        )
-                        return None
-
-                    image_data = await response.read()
-
-            # 创建临时文件来存储图片
-            import tempfile
-
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".jpg") as temp_file:
-                temp_file.write(image_data)
-                temp_file_path = temp_file.name
-
-            try:
-                # 上传图片到飞书
-                with open(temp_file_path, "rb") as image_file:
-                    request = (
-                        CreateImageRequest.builder()
-                        .request_body(
-                            CreateImageRequestBody.builder()
-                            .image_type("message")
-                            .image(image_file)
-                            .build()
-                        )
-                        .build()
-                    )
-
-                    response = client.im.v1.image.create(request)
+            # SDK的请求是同步阻塞的，放到线程中执行，避免阻塞事件循环
+            response = await asyncio.to_thread(client.im.v1.image.create, request)
 
-                    if response.success():
-                        image_key = response.data.image_key
-                        self.logger.info(f"图片上传成功，image_key: {image_key}")
-                        return image_key
-                    else:
-                        self.logger.error(f"图片上传失败: {response.msg}")
-                        return None
-            finally:
-                # 清理临时文件
-                os.unlink(temp_file_path)
+            if response.success():
+                image_key = response.data.image_key
+                self.logger.info(f"图片上传成功，image_key: {image_key}")
+                return image_key
+            else:
+                self.logger.error(f"图片上传失败: {response.msg}")
+                return None
 
         except Exception as e:
             self.logger.error(f"上传图片到飞书异常: {e}")
@@ -170,33 +166,48 @@ class FeishuBot:
         if not self.has_app_config:
             return markdown_content
 
+        # 大部分消息（如系统通知）不含图片，先用子串查找快速排除
+        if "![" not in markdown_content or "](" not in markdown_content:
+            return markdown_content
+
         # 查找所有图片链接
-        image_pattern = r"!\[([^\]]*)\]\(([^)]+)\)"
-        matches = re.findall(image_pattern, markdown_content)
+        matches = _IMAGE_RE.findall(markdown_content)
 
         if not matches:
             return markdown_content
 
         self.logger.info(f"发现 {len(matches)} 个图片链接，开始转换...")
 
-        converted_content = markdown_content
-        for alt_text, image_url in matches:
-            # 跳过已经是image key的情况
-            if image_url.startswith("img_"):
-                continue
-
-            # 上传图片并获取image key
-            image_key = await self.upload_image_to_feishu(image_url)
-            if image_key:
-                # 替换原始链接为image key
-                old_pattern = f"![{alt_text}]({image_url})"
-                new_pattern = f"![{alt_text}]({image_key})"
-                converted_content = converted_content.replace(old_pattern, new_pattern)
+        # 去重后并发上传（跳过已经是image key的链接），用信号量限制并发数
+        image_urls = list(
+            dict.fromkeys(url for _, url in matches if not url.startswith("img_"))
+        )
+        semaphore = asyncio.Semaphore(self.IMAGE_UPLOAD_CONCURRENCY)
+
+        async def upload(image_url: str) -> Optional[str]:
+            async with semaphore:
+                return await self.upload_image_to_feishu(image_url)
+
+        results = await asyncio.gather(
+            *(upload(url) for url in image_urls), return_exceptions=True
+        )
+
+        image_keys = {}
+        for image_url, image_key in zip(image_urls, results):
+            if isinstance(image_key, str) and image_key:
+                image_keys[image_url] = image_key
                 self.logger.info(f"图片转换成功: {image_url} -> {image_key}")
             else:
                 self.logger.warning(f"图片转换失败，保持原链接: {image_url}")
 
-        return converted_content
+        if not image_keys:
+            return markdown_content
+
+        # 一次遍历替换所有图片链接
+        return _IMAGE_RE.sub(
+            lambda m: f"![{m.group(1)}]({image_keys.get(m.group(2), m.group(2))})",
+            markdown_content,
+        )
 
     async def send_card_message(
         self, influencer: str, platform: str, markdown_content: str
@@ -224,14 +235,7 @@ class FeishuBot:
             self.logger.info("开始处理Markdown中的图片链接...")
             converted_content = await self.convert_images_in_markdown(markdown_content)
 
-            # 创建飞书客户端
-            client = (
-                lark.Client.builder()
-                .app_id(self.app_id)
-                .app_secret(self.app_secret)
-                .log_level(lark.LogLevel.ERROR)
-                .build()
-            )
+            client = self._get_lark_client()
 
             # 构建卡片消息内容
             card_content = {
@@ -248,21 +252,22 @@ class FeishuBot:
             }
 
             # 构造请求
+            _, im_v1 = _load_lark()
             request = (
-                CreateMessageRequest.builder()
+                im_v1.CreateMessageRequest.builder()
                 .receive_id_type("open_id")
                 .request_body(
-                    CreateMessageRequestBody.builder()
+                    im_v1.CreateMessageRequestBody.builder()
                     .receive_id(self.user_open_id)
                     .msg_type("interactive")
-                    .content(json.dumps(card_content, ensure_ascii=False))
+                    .content(json_utils.dumps(card_content).decode("utf-8"))
                     .build()
                 )
                 .build()
             )
 
-            # 发送请求
-            response = client.im.v1.message.create(request)
+            # 发送请求（在线程中执行同步的SDK调用）
+            response = await asyncio.to_thread(client.im.v1.message.create, request)
 
             if response.success():
                 self.logger.info(f"飞书卡片消息发送成功: {influencer} - {platform}")
@@ -298,9 +303,7 @@ class FeishuBot:
             emoji = self.LEVEL_EMOJI.get(level, "📢")
 
             # 格式化通知内容
-            from datetime import datetime
-
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
 
             formatted_content = f"**{emoji} {level}**\n\n"
             formatted_content += f"**{title}**\n\n"
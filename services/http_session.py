@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""
+共享HTTP会话模块
+
+进程内复用同一个aiohttp.ClientSession，保持keep-alive连接，
+避免每次请求都重新进行DNS解析、TCP和TLS握手
+"""
+
+import asyncio
+from typing import Optional
+
+import aiohttp
+
+_session: Optional[aiohttp.ClientSession] = None
+_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+async def get_session() -> aiohttp.ClientSession:
+    """
+    获取共享的HTTP会话（首次调用时创建）
+
+    会话与创建它的事件循环绑定，事件循环变化或会话已关闭时会重新创建
+
+    Returns:
+        aiohttp.ClientSession: 共享会话
+    """
+    global _session, _session_loop
+
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _session_loop is not loop:
+        # 限制单个主机的并发连接数，避免多个创作者同时检查时集中冲击同一API
+        connector = aiohttp.TCPConnector(
+            limit=100, limit_per_host=8, ttl_dns_cache=300, keepalive_timeout=75
+        )
+        # 调用方都显式传入Cookie请求头，不使用会话级Cookie存储，避免请求间互相影响
+        _session = aiohttp.ClientSession(
+            connector=connector, cookie_jar=aiohttp.DummyCookieJar()
+        )
+        _session_loop = loop
+    return _session
+
+
+async def close_session() -> None:
+    """关闭共享的HTTP会话（程序退出前调用）"""
+    global _session, _session_loop
+
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+    _session_loop = None
@@ -6,22 +6,54 @@ B站动态监控服务模块
 """
 
 import asyncio
-import json
+import bisect
 import logging
 import os
 import random
+import threading
 import time
-from dataclasses import dataclass
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from datetime import datetime
+from operator import attrgetter
 from typing import Any, Dict, List, Optional, Tuple
 
 import aiohttp
 
+from config import USER_AGENT
+from core import json_utils
+
 from .bilibili_auth import BilibiliAuth
 from .comment_fetcher import CommentFetcher
-
-
-@dataclass
+from .http_session import get_session
+
+# 动态接口的公共请求头（各请求只需补充Referer和Cookie）
+_SPACE_API_HEADERS = {
+    "User-Agent": USER_AGENT,  # 使用配置的UA，与浏览器保持一致
+    "Accept": "application/json, text/plain, */*",
+    "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
+    "Accept-Encoding": "gzip, deflate, br",
+    "Origin": "https://space.bilibili.com",
+    "Connection": "keep-alive",
+    "Sec-Fetch-Dest": "empty",
+    "Sec-Fetch-Mode": "cors",
+    "Sec-Fetch-Site": "same-site",
+    "sec-ch-ua": '"Not_A Brand";v="8", "Chromium";v="120", "Google Chrome";v="120"',
+    "sec-ch-ua-mobile": "?0",
+    "sec-ch-ua-platform": '"Windows"',
+}
+
+# 未配置Cookie时使用的基础标识
+_FALLBACK_COOKIE = "buvid3=generated; b_nut=1234567890"
+
+# 置顶动态的标签文字
+_PINNED_TAG_TEXT = "置顶"
+
+# 视频动态的major类型
+_VIDEO_MAJOR_TYPES = frozenset({"MAJOR_TYPE_ARCHIVE", "archive"})
+
+
+@dataclass(slots=True)
 class Creator:
     """创作者信息"""
 
@@ -30,37 +62,105 @@ class Creator:
     check_interval: int = 300  # 默认5分钟
     enable_comments: bool = False  # 是否启用评论获取
     comment_rules: List[Dict[str, Any]] = None  # 评论筛选规则列表（支持多规则）
+    # 请求动态接口时使用的Referer（创建时生成一次）
+    referer: str = field(init=False, repr=False)
 
     def __post_init__(self):
         """初始化默认值"""
         if self.comment_rules is None:
             self.comment_rules = []
+        self.referer = f"https://space.bilibili.com/{self.uid}/dynamic"
+
+
+@dataclass(slots=True)
+class ItemFeatures:
+    """动态项中排序、筛选和分发需要的字段（每个动态只提取一次）"""
+
+    item: Dict[str, Any]
+    did: str  # 动态ID
+    pub_ts: int  # 发布时间戳
+    is_pinned: bool  # 是否为置顶动态
+    video: Optional[Tuple[str, str]]  # 视频动态的(bvid, 标题)
 
 
 class JsonState:
     """JSON文件状态管理器"""
 
+    # 延迟保存的等待时间（秒），期间的多次修改合并为一次写入
+    SAVE_DELAY = 2.0
+
     def __init__(self, path: str):
         self.path = path
         self.state: Dict[str, Any] = {}
         os.makedirs(os.path.dirname(path), exist_ok=True)
         self._load()
 
+        # 是否有尚未写入文件的修改，以及等待写入的延迟任务
+        self._dirty = False
+        self._save_task: Optional[asyncio.Task] = None
+
+        # 文件可能在线程中写入：按快照版本号保证较旧的内容不会覆盖较新的内容
+        self._write_lock = threading.Lock()
+        self._version = 0
+        self._written_version = 0
+
     def _load(self) -> None:
         if os.path.exists(self.path):
             try:
-                with open(self.path, "r", encoding="utf-8") as f:
-                    self.state = json.load(f)
+                with open(self.path, "rb") as f:
+                    self.state = json_utils.loads(f.read())
             except Exception:
                 self.state = {}
         else:
             self.state = {}
 
     def save(self) -> None:
-        tmp = self.path + ".tmp"
-        with open(tmp, "w", encoding="utf-8") as f:
-            json.dump(self.state, f, ensure_ascii=False, indent=2)
-        os.replace(tmp, self.path)
+        self._write(*self._snapshot())
+
+    async def save_async(self) -> None:
+        """在线程中写入文件，不阻塞事件循环"""
+        await asyncio.to_thread(self._write, *self._snapshot())
+
+    def _snapshot(self) -> Tuple[int, bytes]:
+        """在调用方线程中序列化当前状态，返回(版本号, 文件内容)"""
+        self._version += 1
+        return self._version, json_utils.dumps(self.state, indent=True)
+
+    def _write(self, version: int, content: bytes) -> None:
+        with self._write_lock:
+            if version <= self._written_version:
+                return
+            tmp = self.path + ".tmp"
+            with open(tmp, "wb") as f:
+                f.write(content)
+            os.replace(tmp, self.path)
+            self._written_version = version
+
+    def request_save(self) -> None:
+        """
+        请求延迟保存（需在事件循环中调用）
+
+        SAVE_DELAY秒内的多次请求只写入一次文件，退出前需调用flush()
+        """
+        self._dirty = True
+        if self._save_task is None:
+            self._save_task = asyncio.create_task(self._save_later())
+
+    async def _save_later(self) -> None:
+        await asyncio.sleep(self.SAVE_DELAY)
+        self._save_task = None
+        if self._dirty:
+            self._dirty = False
+            await self.save_async()
+
+    def flush(self) -> None:
+        """立即写入尚未保存的修改"""
+        if self._save_task is not None:
+            self._save_task.cancel()
+            self._save_task = None
+        if self._dirty:
+            self._dirty = False
+            self.save()
 
     def get_last_seen(self, uid: int) -> Optional[str]:
         return self.state.get(str(uid), {}).get("last_seen")
@@ -68,7 +168,8 @@ class JsonState:
     def set_last_seen(self, uid: int, dynamic_id: str) -> None:
         entry = self.state.setdefault(str(uid), {})
         entry["last_seen"] = dynamic_id
-        entry.setdefault("seen", []).append(dynamic_id)
+        # 旧版本记录的已看动态历史没有任何地方读取，更新时顺便清理
+        entry.pop("seen", None)
 
 
 class MonitorService:
@@ -82,6 +183,15 @@ class MonitorService:
     STATE_PATH = os.path.join("data", "bilibili_state.json")
     CREATORS_PATH = os.path.join("data", "bilibili_creators.json")
 
+    # 持续监控启动时，各创作者的首次检查随机分散在最短检查间隔的这一比例内
+    STARTUP_SPREAD_RATIO = 0.2
+
+    # 已解析动态文本的缓存条目上限（推送失败重试时无需重新解析）
+    TEXT_CACHE_MAX_ENTRIES = 256
+
+    # 持续监控时后台检查Cookie的间隔（秒），与BilibiliAuth的检查频率一致
+    COOKIE_CHECK_INTERVAL = 3600
+
     def __init__(self, feishu_bot=None, summarizer=None, cookie: Optional[str] = None):
         """
         初始化监控服务
@@ -97,6 +207,12 @@ class MonitorService:
         self.state = JsonState(self.STATE_PATH)
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
 
+        # 动态ID -> (正文Markdown, 发布时间)
+        self._text_cache: "OrderedDict[str, Tuple[str, str]]" = OrderedDict()
+
+        # UID -> (ETag, Last-Modified)，用于条件请求，动态未变化时跳过解析
+        self._http_cache: Dict[int, Tuple[Optional[str], Optional[str]]] = {}
+
         # 初始化B站认证管理
         self.bili_auth = BilibiliAuth()
 
@@ -133,182 +249,197 @@ class MonitorService:
     @staticmethod
     def get_publish_time(item: Dict[str, Any]) -> str:
         """获取动态的发布时间"""
-        try:
-            modules = item.get("modules", {})
-            if not modules:
-                return ""
+        modules = item.get("modules")
+        if not modules:
+            return ""
 
-            author = modules.get("module_author", {})
-            if author and isinstance(author, dict):
-                pub_ts = author.get("pub_ts")
-                if pub_ts:
-                    dt = datetime.fromtimestamp(pub_ts)
-                    return f"发布时间：{dt.strftime('%Y-%m-%d %H:%M:%S')}"
+        author = modules.get("module_author")
+        if not author or not isinstance(author, dict):
+            return ""
 
-                pub_time = author.get("pub_time")
-                if pub_time:
-                    return f"发布时间：{pub_time}"
+        pub_ts = author.get("pub_ts")
+        if pub_ts:
+            try:
+                dt = datetime.fromtimestamp(pub_ts)
+            except (TypeError, ValueError, OverflowError, OSError) as e:
+                logging.error(f"获取发布时间出错: {e}")
+                return ""
+            return f"发布时间：{dt.strftime('%Y-%m-%d %H:%M:%S')}"
 
-            return ""
-        except Exception as e:
-            logging.error(f"获取发布时间出错: {e}")
-            return ""
+        pub_time = author.get("pub_time")
+        if pub_time:
+            return f"发布时间：{pub_time}"
+
+        return ""
 
     @staticmethod
     def get_publish_timestamp(item: Dict[str, Any]) -> int:
         """获取动态的发布时间戳（用于排序）"""
-        try:
-            modules = item.get("modules", {})
-            if modules:
-                author = modules.get("module_author", {})
-                if author and isinstance(author, dict):
-                    pub_ts = author.get("pub_ts")
-                    if pub_ts:
-                        return int(pub_ts)
-
-            timestamp = item.get("timestamp")
-            if timestamp:
-                return int(timestamp)
-
-            return 0
-        except Exception:
-            return 0
+        modules = item.get("modules")
+        if modules:
+            author = modules.get("module_author")
+            if author and isinstance(author, dict):
+                pub_ts = author.get("pub_ts")
+                if pub_ts:
+                    return int(pub_ts)
+
+        timestamp = item.get("timestamp")
+        return int(timestamp) if timestamp else 0
 
     @staticmethod
     def is_pinned_dynamic(item: Dict[str, Any]) -> bool:
         """检查动态是否为置顶动态"""
-        try:
-            modules = item.get("modules", {})
-            if not modules:
-                return False
-
-            module_tag = modules.get("module_tag", {})
-            if not module_tag:
-                return False
+        modules = item.get("modules")
+        if not modules:
+            return False
 
-            tag_text = module_tag.get("text", "")
-            return tag_text == "置顶"
-        except Exception:
+        module_tag = modules.get("module_tag")
+        if not module_tag:
             return False
 
+        return module_tag.get("text", "") == _PINNED_TAG_TEXT
+
     @staticmethod
     def parse_text_from_item(item: Dict[str, Any]) -> str:
         """从动态项解析文本内容"""
-        try:
-            modules = item.get("modules", {})
-            if not modules:
-                return ""
+        modules = item.get("modules")
+        if not modules:
+            return ""
 
-            dynamic = modules.get("module_dynamic")
-            if not dynamic or not isinstance(dynamic, dict):
-                return ""
+        dynamic = modules.get("module_dynamic")
+        if not dynamic or not isinstance(dynamic, dict):
+            return ""
 
-            text_parts = []
-            image_urls = []
-
-            # 解析主要内容
-            major = dynamic.get("major", {})
-            if major and isinstance(major, dict):
-                major_type = major.get("type", "")
-
-                # 处理OPUS类型动态（图文混排）
-                if major_type == "MAJOR_TYPE_OPUS":
-                    opus = major.get("opus")
-                    if opus and isinstance(opus, dict):
-                        title = opus.get("title")
-                        if title:
-                            text_parts.append(f"**{title}**\n")
-
-                        summary = opus.get("summary")
-                        if summary and isinstance(summary, dict):
-                            text = summary.get("text", "")
-                            if text and isinstance(text, str):
-                                text_parts.append(text.strip())
-
-                        # 提取图片URL
-                        pics = opus.get("pics", [])
-                        for pic in pics:
-                            if isinstance(pic, dict):
-                                img_url = pic.get("url")
-                                if img_url:
-                                    image_urls.append(img_url)
-
-                # 处理图片动态（draw类型）
-                elif major_type == "MAJOR_TYPE_DRAW":
-                    draw = major.get("draw", {})
-                    if draw:
-                        items = draw.get("items", [])
-                        for item_data in items:
-                            if isinstance(item_data, dict):
-                                src = item_data.get("src")
-                                if src:
-                                    image_urls.append(src)
-
-            # 如果major中没有文本，尝试从desc中获取
-            if not text_parts:
-                desc = dynamic.get("desc")
-                if desc and isinstance(desc, dict):
-                    rich_text_nodes = desc.get("rich_text_nodes", [])
-                    if rich_text_nodes:
-                        for node in rich_text_nodes:
-                            if (
-                                isinstance(node, dict)
-                                and node.get("type") == "RICH_TEXT_NODE_TYPE_TEXT"
-                            ):
-                                text_content = node.get("text", "")
-                                if text_content:
-                                    text_parts.append(text_content)
-                    else:
-                        text = desc.get("text")
+        text_parts = []
+        image_urls = []
+
+        # 解析主要内容
+        major = dynamic.get("major", {})
+        if major and isinstance(major, dict):
+            major_type = major.get("type", "")
+
+            # 处理OPUS类型动态（图文混排）
+            if major_type == "MAJOR_TYPE_OPUS":
+                opus = major.get("opus")
+                if opus and isinstance(opus, dict):
+                    title = opus.get("title")
+                    if title:
+                        text_parts.append(f"**{title}**\n")
+
+                    summary = opus.get("summary")
+                    if summary and isinstance(summary, dict):
+                        text = summary.get("text", "")
                         if text and isinstance(text, str):
                             text_parts.append(text.strip())
 
-            # 构建最终的Markdown内容
-            result_parts = []
-            if text_parts:
-                result_parts.append("".join(text_parts).strip())
-
-            # 添加图片作为Markdown图片链接
-            if image_urls:
-                if result_parts:
-                    result_parts.append("")
-                for i, img_url in enumerate(image_urls, 1):
-                    result_parts.append(f"![图片{i}]({img_url})")
-
-            return "\n".join(result_parts) if result_parts else ""
-        except Exception as e:
-            logging.error(f"解析动态文本时出错: {e}")
-            return ""
+                    # 提取图片URL
+                    pics = opus.get("pics") or []
+                    for pic in pics:
+                        if isinstance(pic, dict):
+                            img_url = pic.get("url")
+                            if img_url:
+                                image_urls.append(img_url)
+
+            # 处理图片动态（draw类型）
+            elif major_type == "MAJOR_TYPE_DRAW":
+                draw = major.get("draw", {})
+                if draw:
+                    items = draw.get("items") or []
+                    for item_data in items:
+                        if isinstance(item_data, dict):
+                            src = item_data.get("src")
+                            if src:
+                                image_urls.append(src)
+
+        # 如果major中没有文本，尝试从desc中获取
+        if not text_parts:
+            desc = dynamic.get("desc")
+            if desc and isinstance(desc, dict):
+                rich_text_nodes = desc.get("rich_text_nodes", [])
+                if rich_text_nodes:
+                    for node in rich_text_nodes:
+                        if (
+                            isinstance(node, dict)
+                            and node.get("type") == "RICH_TEXT_NODE_TYPE_TEXT"
+                        ):
+                            text_content = node.get("text", "")
+                            if text_content:
+                                text_parts.append(text_content)
+                else:
+                    text = desc.get("text")
+                    if text and isinstance(text, str):
+                        text_parts.append(text.strip())
+
+        # 构建最终的Markdown内容
+        result_parts = []
+        if text_parts:
+            result_parts.append("".join(text_parts).strip())
+
+        # 添加图片作为Markdown图片链接
+        if image_urls:
+            if result_parts:
+                result_parts.append("")
+            for i, img_url in enumerate(image_urls, 1):
+                result_parts.append(f"![图片{i}]({img_url})")
+
+        return "\n".join(result_parts) if result_parts else ""
+
+    def _get_rendered_text(self, did: str, item: Dict[str, Any]) -> Tuple[str, str]:
+        """获取动态的正文和发布时间（按动态ID缓存，超过上限时淘汰最久未使用的条目）"""
+        cached = self._text_cache.get(did)
+        if cached is not None:
+            self._text_cache.move_to_end(did)
+            return cached
+
+        rendered = (self.parse_text_from_item(item), self.get_publish_time(item))
+        self._text_cache[did] = rendered
+        if len(self._text_cache) > self.TEXT_CACHE_MAX_ENTRIES:
+            self._text_cache.popitem(last=False)
+        return rendered
 
     @staticmethod
     def extract_video_info(item: Dict[str, Any]) -> Optional[Tuple[str, str]]:
         """从动态项提取视频信息"""
-        dynamic = item.get("modules", {}).get("module_dynamic", {})
-        major = dynamic.get("major", {})
+        dynamic = (item.get("modules") or {}).get("module_dynamic") or {}
+        major = dynamic.get("major")
         if not major:
             return None
-        if major.get("type") in ("MAJOR_TYPE_ARCHIVE", "archive"):
-            archive = major.get("archive", {})
+        if major.get("type") in _VIDEO_MAJOR_TYPES:
+            archive = major.get("archive") or {}
             bvid = archive.get("bvid")
             title = archive.get("title") or ""
             if bvid:
                 return bvid, title
         return None
 
+    @classmethod
+    def _extract_features(cls, item: Dict[str, Any]) -> ItemFeatures:
+        """提取动态项的派生字段（排序、置顶判断和视频处理都只需计算一次）"""
+        return ItemFeatures(
+            item=item,
+            did=str(item.get("id_str") or item.get("id")),
+            pub_ts=cls.get_publish_timestamp(item),
+            is_pinned=cls.is_pinned_dynamic(item),
+            video=cls.extract_video_info(item),
+        )
+
     async def fetch_user_space_dynamics(
-        self, session: aiohttp.ClientSession, uid: int, limit_recent: int = 20
-    ) -> Dict[str, Any]:
+        self, session: aiohttp.ClientSession, creator: Creator, limit_recent: int = 20
+    ) -> Optional[Dict[str, Any]]:
         """
         获取用户空间动态
 
+        上次响应带有ETag/Last-Modified时发送条件请求，服务端返回304时不再解析
+
         Args:
             session: HTTP会话
-            uid: 用户ID
+            creator: 创作者信息
             limit_recent: 限制获取最近的动态数量
 
         Returns:
-            Dict: API响应数据
+            Optional[Dict]: API响应数据，动态未变化（304）时返回None
         """
+        uid = creator.uid
         params = {
             "offset": "",
             "host_mid": str(uid),
@@ -318,36 +449,36 @@ class MonitorService:
             "web_location": "333.1387",
         }
 
-        # 导入统一配置的User-Agent
-        from config import USER_AGENT
-
         headers = {
-            "User-Agent": USER_AGENT,  # 使用配置的UA，与浏览器保持一致
-            "Referer": f"https://space.bilibili.com/{uid}/dynamic",
-            "Accept": "application/json, text/plain, */*",
-            "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
-            "Accept-Encoding": "gzip, deflate, br",
-            "Origin": "https://space.bilibili.com",
-            "Connection": "keep-alive",
-            "Sec-Fetch-Dest": "empty",
-            "Sec-Fetch-Mode": "cors",
-            "Sec-Fetch-Site": "same-site",
-            "sec-ch-ua": '"Not_A Brand";v="8", "Chromium";v="120", "Google Chrome";v="120"',
-            "sec-ch-ua-mobile": "?0",
-            "sec-ch-ua-platform": '"Windows"',
+            **_SPACE_API_HEADERS,
+            "Referer": creator.referer,
+            # 即使没有完整Cookie，也添加一些基础标识
+            "Cookie": self.cookie or _FALLBACK_COOKIE,
         }
 
-        if self.cookie:
-            headers["Cookie"] = self.cookie
-        else:
-            # 即使没有完整Cookie，也添加一些基础标识
-            headers["Cookie"] = "buvid3=generated; b_nut=1234567890"
+        etag, last_modified = self._http_cache.get(uid, (None, None))
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
 
         async with session.get(
             self.BILI_SPACE_API, params=params, headers=headers, timeout=20
         ) as resp:
             resp.raise_for_status()
-            data = await resp.json()
+            if resp.status == 304:
+                return None
+
+            # 先清除旧的校验值，解析失败时下次请求不会得到304
+            self._http_cache.pop(uid, None)
+            data = json_utils.loads(await resp.read())
+
+            # B站风控、鉴权失败等错误也以HTTP 200返回（code != 0），
+            # 只缓存正常响应的校验值，避免错误被后续的304掩盖
+            etag = resp.headers.get("ETag")
+            last_modified = resp.headers.get("Last-Modified")
+            if data.get("code") == 0 and (etag or last_modified):
+                self._http_cache[uid] = (etag, last_modified)
 
             # 限制返回的动态数量
             if "data" in data and "items" in data["data"]:
@@ -368,39 +499,47 @@ class MonitorService:
             creator: 创作者信息
         """
         # 获取最近20个动态
-        data = await self.fetch_user_space_dynamics(session, creator.uid, 20)
+        data = await self.fetch_user_space_dynamics(session, creator, 20)
+        if data is None:
+            self.logger.debug(f"{creator.name}: 动态未变化（304），跳过")
+            return
 
         # 调试：打印API响应
         self.logger.debug(
             f"API响应状态: code={data.get('code')}, message={data.get('message')}"
         )
 
-        items = data.get("data", {}).get("items", [])
+        # 先检查错误码，错误响应中的动态不做处理
+        if data.get("code") != 0:
+            error_msg = f"API返回错误: code={data.get('code')}, message={data.get('message')}"
+            self.logger.warning(f"{creator.name} ({creator.uid}) - {error_msg}")
+            # 发送API错误通知
+            if self.feishu_bot:
+                try:
+                    await self.feishu_bot.send_system_notification(
+                        self.feishu_bot.LEVEL_WARNING,
+                        "B站API请求失败",
+                        f"获取创作者动态失败\n\n**创作者:** {creator.name}\n**UID:** {creator.uid}\n**错误代码:** {data.get('code')}\n**错误信息:** {data.get('message')}",
+                    )
+                except Exception:
+                    pass
+            return
+
+        items = (data.get("data") or {}).get("items")
         if not items:
-            # 检查是否有错误信息
-            if data.get("code") != 0:
-                error_msg = f"API返回错误: code={data.get('code')}, message={data.get('message')}"
-                self.logger.warning(f"{creator.name} ({creator.uid}) - {error_msg}")
-                # 发送API错误通知
-                if self.feishu_bot:
-                    try:
-                        await self.feishu_bot.send_system_notification(
-                            self.feishu_bot.LEVEL_WARNING,
-                            "B站API请求失败",
-                            f"获取创作者动态失败\n\n**创作者:** {creator.name}\n**UID:** {creator.uid}\n**错误代码:** {data.get('code')}\n**错误信息:** {data.get('message')}",
-                        )
-                    except Exception:
-                        pass
-            else:
-                self.logger.info(
-                    f"No items for {creator.name} ({creator.uid}) - 该用户可能没有发布动态"
-                )
+            self.logger.info(
+                f"No items for {creator.name} ({creator.uid}) - 该用户可能没有发布动态"
+            )
             return
 
         self.logger.debug(f"{creator.name}: 获取到 {len(items)} 个最近动态")
 
-        # 按发布时间戳排序
-        items.sort(key=self.get_publish_timestamp, reverse=True)
+        # 每个动态只提取一次字段，按发布时间戳排序（从新到旧）
+        features = sorted(
+            map(self._extract_features, items),
+            key=attrgetter("pub_ts"),
+            reverse=True,
+        )
 
         last_seen = self.state.get_last_seen(creator.uid)
         if last_seen is None:
@@ -413,39 +552,36 @@ class MonitorService:
             time_window_seconds = time_window_hours * 3600
             earliest_allowed_timestamp = current_time - time_window_seconds
 
-            initial_items = []
-            for item in items:
-                if self.is_pinned_dynamic(item):
+            initial_features = []
+            for feat in features:
+                if feat.is_pinned:
                     continue
-                item_timestamp = self.get_publish_timestamp(item)
-                if item_timestamp >= earliest_allowed_timestamp:
-                    initial_items.append(item)
-                    if len(initial_items) >= 3:  # 最多推送3条
+                if feat.pub_ts >= earliest_allowed_timestamp:
+                    initial_features.append(feat)
+                    if len(initial_features) >= 3:  # 最多推送3条
                         break
 
-            if initial_items:
+            if initial_features:
                 # 按时间顺序处理（从旧到新）
-                initial_items.sort(key=self.get_publish_timestamp)
+                initial_features.sort(key=attrgetter("pub_ts"))
 
                 self.logger.info(
-                    f"首次运行：为 {creator.name} 推送 {len(initial_items)} 条最新动态"
+                    f"首次运行：为 {creator.name} 推送 {len(initial_features)} 条最新动态"
                 )
 
-                for it in initial_items:
-                    await self._process_dynamic_item(it, creator)
+                for feat in initial_features:
+                    await self._process_dynamic_item(feat, creator)
 
                 # 设置最新的为已看过
-                newest_processed = str(
-                    initial_items[-1].get("id_str") or initial_items[-1].get("id")
-                )
-                self.state.set_last_seen(creator.uid, newest_processed)
-                self.state.save()
+                self.state.set_last_seen(creator.uid, initial_features[-1].did)
+                self.state.request_save()
             else:
                 # 如果没有符合条件的动态，设置最新动态为已看过
-                newest_id = items[0].get("id_str") or items[0].get("id")
+                newest = features[0].item
+                newest_id = newest.get("id_str") or newest.get("id")
                 if newest_id:
                     self.state.set_last_seen(creator.uid, str(newest_id))
-                    self.state.save()
+                    self.state.request_save()
                     self.logger.info(
                         f"首次运行：{creator.name} 没有最近48小时内的动态，已初始化状态"
                     )
@@ -454,19 +590,19 @@ class MonitorService:
         # 找到上次看过的动态的时间戳
         last_seen_timestamp = 0
         last_seen_found = False
-        for item in items:
-            item_id = str(item.get("id_str") or item.get("id"))
-            if item_id == last_seen:
-                last_seen_timestamp = self.get_publish_timestamp(item)
+        for feat in features:
+            if feat.did == last_seen:
+                last_seen_timestamp = feat.pub_ts
                 last_seen_found = True
                 break
 
         # 如果找不到last_seen，更新为最新动态
         if not last_seen_found:
-            newest_id = items[0].get("id_str") or items[0].get("id")
+            newest = features[0].item
+            newest_id = newest.get("id_str") or newest.get("id")
             if newest_id:
                 self.state.set_last_seen(creator.uid, str(newest_id))
-                self.state.save()
+                self.state.request_save()
                 self.logger.warning(
                     f"Last seen dynamic for {creator.name} not found. Updated to latest."
                 )
@@ -478,51 +614,41 @@ class MonitorService:
         time_window_seconds = time_window_hours * 3600
         earliest_allowed_timestamp = current_time - time_window_seconds
 
-        new_items: List[Dict[str, Any]] = []
-
-        for item in items:
-            if self.is_pinned_dynamic(item):
-                continue
-
-            item_timestamp = self.get_publish_timestamp(item)
-
-            if item_timestamp < earliest_allowed_timestamp:
-                continue
-
-            if item_timestamp > last_seen_timestamp:
-                new_items.append(item)
+        # features按时间戳降序排列，晚于last_seen且在时间窗口内的动态一定是其前缀，
+        # 用二分查找确定前缀的结束位置
+        neg_timestamps = [-feat.pub_ts for feat in features]
+        end = min(
+            bisect.bisect_left(neg_timestamps, -last_seen_timestamp),
+            bisect.bisect_right(neg_timestamps, -earliest_allowed_timestamp),
+        )
+        new_features = [feat for feat in features[:end] if not feat.is_pinned]
 
-        if not new_items:
+        if not new_features:
             self.logger.debug(f"No new dynamics for {creator.name}")
             return
 
         # 按时间顺序处理
-        new_items.sort(key=self.get_publish_timestamp)
+        new_features.sort(key=attrgetter("pub_ts"))
 
-        self.logger.info(f"Found {len(new_items)} new dynamics for {creator.name}")
+        self.logger.info(f"Found {len(new_features)} new dynamics for {creator.name}")
 
-        for it in new_items:
-            await self._process_dynamic_item(it, creator)
+        for feat in new_features:
+            await self._process_dynamic_item(feat, creator)
 
         # 更新last_seen
-        newest_processed = str(new_items[-1].get("id_str") or new_items[-1].get("id"))
-        self.state.set_last_seen(creator.uid, newest_processed)
-        self.state.save()
+        self.state.set_last_seen(creator.uid, new_features[-1].did)
+        self.state.request_save()
 
-    async def _process_dynamic_item(
-        self, item: Dict[str, Any], creator: Creator
-    ) -> None:
+    async def _process_dynamic_item(self, feat: ItemFeatures, creator: Creator) -> None:
         """处理单个动态项"""
-        did = str(item.get("id_str") or item.get("id"))
-        url = self.DYNAMIC_PC_URL.format(dynamic_id=did)
-        vinfo = self.extract_video_info(item)
+        url = self.DYNAMIC_PC_URL.format(dynamic_id=feat.did)
 
-        if vinfo:
+        if feat.video:
             # 处理视频动态
-            await self._process_video_dynamic(item, vinfo, creator, url)
+            await self._process_video_dynamic(feat.item, feat.video, creator, url)
         else:
             # 处理普通动态
-            await self._process_text_dynamic(item, creator, url)
+            await self._process_text_dynamic(feat, creator, url)
 
     async def _process_video_dynamic(
         self,
@@ -537,40 +663,23 @@ class MonitorService:
 
         pub_time = self.get_publish_time(item)
 
-        # 构建markdown内容
-        markdown_content = (
-            f"**{title}**\n\n[原视频链接]({video_url})\n[动态链接]({dynamic_url})"
+        # 构建markdown内容（各段落最后用空行拼接）
+        parts = [f"**{title}**\n\n[原视频链接]({video_url})\n[动态链接]({dynamic_url})"]
+
+        # 🆕 评论获取和AI总结互不依赖，并发执行
+        comment_content, summary_text = await asyncio.gather(
+            self._fetch_video_comments(bvid, title, creator),
+            self._summarize_video(video_url),
         )
 
-        # 🆕 评论获取功能
-        comment_content = await self._fetch_video_comments(bvid, title, creator)
+        # 添加评论、总结和时间
         if comment_content:
-            markdown_content += f"\n\n{comment_content}"
-
-        # AI总结
-        summary_text = None
-        try:
-            if self.summarizer is not None:
-                ok, message, links, contents = await self.summarizer.summarize_videos(
-                    [video_url]
-                )
-                if ok and contents and contents[0]:
-                    summary_text = f"**AI 总结**\n\n{contents[0]}"
-                    if links and links[0]:
-                        summary_text += f"\n\n[查看完整总结]({links[0]})"
-                elif ok and links:
-                    summary_text = f"[AI总结链接]({links[0]})"
-                else:
-                    summary_text = f"AI总结失败：{message}"
-        except Exception as e:
-            self.logger.error(f"AI总结异常: {e}")
-            summary_text = f"AI总结异常：{str(e)}"
-
-        # 添加总结和时间
+            parts.append(comment_content)
         if summary_text:
-            markdown_content += f"\n\n{summary_text}"
+            parts.append(summary_text)
         if pub_time:
-            markdown_content += f"\n\n{pub_time}"
+            parts.append(pub_time)
+        markdown_content = "\n\n".join(parts)
 
         # 发送到飞书
         if self.feishu_bot:
@@ -578,6 +687,35 @@ class MonitorService:
                 creator.name, "哔哩哔哩", markdown_content
             )
 
+    async def _summarize_video(self, video_url: str) -> Optional[str]:
+        """
+        生成视频的AI总结段落
+
+        Args:
+            video_url: 视频链接
+
+        Returns:
+            总结段落（失败时为错误说明），未配置总结服务时返回None
+        """
+        if self.summarizer is None:
+            return None
+
+        try:
+            ok, message, links, contents = await self.summarizer.summarize_videos(
+                [video_url]
+            )
+            if ok and contents and contents[0]:
+                summary_text = f"**AI 总结**\n\n{contents[0]}"
+                if links and links[0]:
+                    summary_text += f"\n\n[查看完整总结]({links[0]})"
+                return summary_text
+            if ok and links:
+                return f"[AI总结链接]({links[0]})"
+            return f"AI总结失败：{message}"
+        except Exception as e:
+            self.logger.error(f"AI总结异常: {e}")
+            return f"AI总结异常：{str(e)}"
+
     async def _fetch_video_comments(
         self, bvid: str, video_title: str, creator: Creator
     ) -> Optional[str]:
@@ -624,38 +762,37 @@ class MonitorService:
             video_url = f"https://www.bilibili.com/video/{bvid}/"
 
             # 格式化评论（包含视频链接）
-            comment_section = "---\n\n### 🔥 精选评论\n\n"
-            comment_section += f"**视频**: {video_title}\n\n"
-            comment_section += f"🔗 [点击查看原视频]({video_url})\n\n"
-            comment_section += "---\n\n"
-
+            parts = [
+                "---\n\n### 🔥 精选评论\n\n",
+                f"**视频**: {video_title}\n\n",
+                f"🔗 [点击查看原视频]({video_url})\n\n",
+                "---\n\n",
+            ]
             for idx, comm in enumerate(comments, 1):
                 comment_text = self.comment_fetcher.format_comment_for_display(comm)
-                comment_section += f"**评论 {idx}:**\n\n{comment_text}\n\n"
+                parts.append(f"**评论 {idx}:**\n\n{comment_text}\n\n")
 
             self.logger.info(f"成功获取 {len(comments)} 条符合条件的评论")
-            return comment_section
+            return "".join(parts)
 
         except Exception as e:
             self.logger.error(f"获取视频评论失败: {e}", exc_info=True)
             return None
 
     async def _process_text_dynamic(
-        self, item: Dict[str, Any], creator: Creator, url: str
+        self, feat: ItemFeatures, creator: Creator, url: str
     ) -> None:
         """处理文字动态"""
-        text = self.parse_text_from_item(item)
+        text, pub_time = self._get_rendered_text(feat.did, feat.item)
         if not text:
             text = "(无文本内容)"
 
-        pub_time = self.get_publish_time(item)
-
         # 构建markdown内容
-        markdown_content = text
+        parts = [text]
         if pub_time:
-            markdown_content = f"{text}\n\n{pub_time}"
-
-        markdown_content += f"\n\n[查看原动态]({url})"
+            parts.append(pub_time)
+        parts.append(f"[查看原动态]({url})")
+        markdown_content = "\n\n".join(parts)
 
         # 发送到飞书
         if self.feishu_bot:
@@ -687,6 +824,8 @@ class MonitorService:
 
             except Exception as e:
                 self.logger.error(f"监控创作者 {creator.name} 时出错: {e}")
+                # 本次处理失败，下次需要重新获取完整动态，不能因304而跳过
+                self._http_cache.pop(creator.uid, None)
                 # 发送监控异常通知
                 if self.feishu_bot:
                     try:
@@ -699,6 +838,24 @@ class MonitorService:
                         pass
                 await asyncio.sleep(60)
 
+    async def _refresh_cookie_if_needed(self) -> None:
+        """自动检查并刷新Cookie（如果需要且有refresh_token）"""
+        self.logger.info("检查Cookie是否需要刷新...")
+        refreshed_cookie = await self.bili_auth.auto_refresh_if_needed(self.cookie)
+        if refreshed_cookie != self.cookie:
+            self.logger.info("Cookie已自动刷新")
+            self.cookie = refreshed_cookie
+            # TODO: 更新到config或.env文件
+        else:
+            self.logger.info("Cookie无需刷新")
+
+    async def _cookie_refresh_loop(self) -> None:
+        """后台定期检查Cookie，刷新后的Cookie直接用于后续的动态请求"""
+        while True:
+            await self._refresh_cookie_if_needed()
+            # 间隔加入随机抖动，避免多实例部署时同时请求
+            await asyncio.sleep(self.COOKIE_CHECK_INTERVAL * random.uniform(0.9, 1.1))
+
     async def start_monitoring(
         self, creators: List[Creator], once: bool = False
     ) -> None:
@@ -709,19 +866,13 @@ class MonitorService:
             creators: 创作者列表
             once: 是否只运行一次
         """
-        # 自动检查并刷新Cookie（如果需要且有refresh_token）
-        if self.cookie:
-            self.logger.info("检查Cookie是否需要刷新...")
-            refreshed_cookie = await self.bili_auth.auto_refresh_if_needed(self.cookie)
-            if refreshed_cookie != self.cookie:
-                self.logger.info("Cookie已自动刷新")
-                self.cookie = refreshed_cookie
-                # TODO: 更新到config或.env文件
-            else:
-                self.logger.info("Cookie无需刷新")
+        # 一次性检查模式在请求前检查Cookie；持续监控模式改为后台定期检查，不阻塞首次请求
+        if self.cookie and once:
+            await self._refresh_cookie_if_needed()
 
-        timeout = aiohttp.ClientTimeout(total=30)
-        async with aiohttp.ClientSession(timeout=timeout) as session:
+        # 所有创作者共用进程级的HTTP会话，监控重启后也复用已建立的keep-alive连接
+        session = await get_session()
+        try:
             if once:
                 # 一次性检查模式
                 for c in creators:
@@ -730,14 +881,22 @@ class MonitorService:
                 # 持续监控模式
                 self.logger.info(f"启动持续监控模式，共 {len(creators)} 个创作者")
 
+                # 首次检查随机错开，既不会同时请求，也不会让靠后的创作者等待太久
+                spread = (
+                    min((c.check_interval for c in creators), default=0)
+                    * self.STARTUP_SPREAD_RATIO
+                )
+
                 tasks = []
-                for i, creator in enumerate(creators):
-                    initial_delay = i * 30  # 每个创作者间隔30秒启动
+                if self.cookie:
+                    tasks.append(asyncio.create_task(self._cookie_refresh_loop()))
+                for creator in creators:
+                    initial_delay = random.uniform(0, spread)
 
                     async def delayed_monitor(creator, delay):
                         if delay > 0:
                             self.logger.info(
-                                f"创作者 {creator.name}: 将在 {delay} 秒后开始监控"
+                                f"创作者 {creator.name}: 将在 {delay:.0f} 秒后开始监控"
                             )
                             await asyncio.sleep(delay)
                         await self.monitor_single_creator(session, creator)
@@ -749,9 +908,14 @@ class MonitorService:
                     await asyncio.gather(*tasks)
                 except KeyboardInterrupt:
                     self.logger.info("收到停止信号，正在关闭监控...")
+                finally:
+                    # 无论因中断、取消还是异常退出，都取消并等待所有监控任务结束
                     for task in tasks:
                         task.cancel()
                     await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            # 退出前写入尚未保存的状态（包括被取消时）
+            self.state.flush()
 
     @staticmethod
     def load_creators_from_file(path: str = CREATORS_PATH) -> List[Creator]:
@@ -764,12 +928,12 @@ class MonitorService:
         ]
 
         if not os.path.exists(path):
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump(default, f, ensure_ascii=False, indent=2)
+            with open(path, "wb") as f:
+                f.write(json_utils.dumps(default, indent=True))
 
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                items = json.load(f)
+            with open(path, "rb") as f:
+                items = json_utils.loads(f.read())
             creators = []
             for i in items:
                 creator = Creator(
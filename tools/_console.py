@@ -0,0 +1,15 @@
+# -*- coding: utf-8 -*-
+"""
+控制台输出工具
+
+供tools下的脚本共用的分隔线和标题格式
+"""
+
+# 控制台分隔线
+EQ_LINE = "=" * 70
+DASH_LINE = "-" * 70
+
+
+def banner(title: str) -> str:
+    """生成上下带分隔线的标题"""
+    return f"{EQ_LINE}\n{title}\n{EQ_LINE}"
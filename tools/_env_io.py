@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""
+.env文件读写工具
+
+供tools下的脚本共用：一次读取、一次遍历更新多个字段、一次原子写回
+"""
+
+import os
+from pathlib import Path
+from typing import Dict, Optional
+
+
+def update_env_vars(
+    path: Path, updates: Dict[str, str], comments: Optional[Dict[str, str]] = None
+) -> None:
+    """
+    批量更新.env文件中的配置项
+
+    已存在的字段原地替换，不存在的字段追加到文件末尾
+
+    Args:
+        path: .env文件路径
+        updates: 要写入的字段 -> 值
+        comments: 追加新字段时写在其上方的注释（字段 -> 注释）
+    """
+    comments = comments or {}
+
+    # 读取现有配置
+    env_lines = []
+    if path.exists():
+        with open(path, "r", encoding="utf-8") as f:
+            env_lines = f.readlines()
+
+    # 一次遍历替换所有已存在的字段
+    seen = set()
+    for i, line in enumerate(env_lines):
+        key = line.split("=", 1)[0]
+        if "=" in line and key in updates:
+            env_lines[i] = f"{key}={updates[key]}\n"
+            seen.add(key)
+
+    # 没找到的字段追加到末尾（原文件最后一行没有换行符时先补上，避免与新字段连成一行）
+    if env_lines and not env_lines[-1].endswith("\n"):
+        env_lines[-1] += "\n"
+    for key, value in updates.items():
+        if key in seen:
+            continue
+        if key in comments:
+            env_lines.extend(("\n", f"# {comments[key]}\n"))
+        env_lines.append(f"{key}={value}\n")
+
+    # 先写临时文件再原子替换，避免写入中断导致.env损坏
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.writelines(env_lines)
+    os.replace(tmp_path, path)
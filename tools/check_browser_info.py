@@ -5,22 +5,151 @@
 检查当前Cookie对应的浏览器信息，确保请求头匹配
 """
 
+import asyncio
+import logging
 import sys
+import threading
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from pathlib import Path
+from typing import List, Optional, Tuple
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from config import BILIBILI_CONFIG
+from config import BILIBILI_CONFIG, build_bilibili_cookie
+from tools._console import DASH_LINE, EQ_LINE, banner
+from tools._env_io import update_env_vars
+
+try:
+    from dotenv import dotenv_values
+except ImportError:
+
+    def dotenv_values(*args, **kwargs):
+        """备用函数，无法读取.env时总是写入"""
+        return {}
+
+
+# 项目根目录下的.env文件
+ENV_FILE = Path(__file__).resolve().parent.parent / ".env"
+
+# 获取User-Agent的操作说明（整块输出，避免逐行print）
+_USER_AGENT_INSTRUCTIONS = f"""
+{EQ_LINE}
+🔍 获取你的浏览器User-Agent
+{EQ_LINE}
+
+请按照以下步骤获取你的浏览器User-Agent:
+{DASH_LINE}
+
+方法1：从Console获取（最简单）
+1. 在B站页面按F12打开开发者工具
+2. 切换到 [Console] 控制台
+3. 输入以下命令并回车:
+   navigator.userAgent
+4. 复制输出的完整字符串
+
+方法2：从Network面板获取
+1. 在B站页面按F12打开开发者工具
+2. 切换到 [Network] 标签
+3. 刷新页面(F5)
+4. 点击任意请求
+5. 在Request Headers中找到 User-Agent
+6. 复制它的值
+
+{DASH_LINE}
+
+请粘贴你的User-Agent:
+（如果留空，将使用默认值）
+
+"""
+
+# 配置完成后的总结
+_SUMMARY_TEMPLATE = f"""
+{banner('[SUCCESS] 配置完成！')}
+
+✅ 配置建议:
+{DASH_LINE}
+1. ✅ Cookie已配置
+{{refresh_token_status}}
+3. ✅ User-Agent已配置
+{{cookie_status}}
+
+🔒 安全建议:
+{DASH_LINE}
+• buvid3 来自你的浏览器，保持不变 ✅
+• User-Agent 与浏览器匹配，降低风控风险 ✅
+• refresh_token 启用自动刷新，长期有效 ✅
+
+下一步:
+1. 重启程序以加载新配置
+2. 运行测试: uv run python test_api.py
+3. 启动监控: uv run python main.py --mode monitor
+"""
+
+
+class _LogCollector(logging.Handler):
+    """收集日志消息而不输出到控制台"""
+
+    def __init__(self, level: int = logging.WARNING):
+        super().__init__(level)
+        self.messages: List[str] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.messages.append(record.getMessage())
+
+
+async def _check_cookie(cookie: str) -> Tuple[bool, Optional[int]]:
+    """检查Cookie是否需要刷新"""
+    from services.bilibili_auth import BilibiliAuth
+    from services.http_session import close_session
+
+    try:
+        return await BilibiliAuth().check_need_refresh(cookie)
+    finally:
+        await close_session()
+
+
+def _start_cookie_check(
+    cookie: str,
+) -> "Future[Tuple[bool, Optional[int], Optional[str]]]":
+    """
+    在后台线程中检查Cookie，与等待用户输入同时进行
+
+    使用守护线程，用户按Ctrl+C时可以直接退出，无需等待网络请求结束。
+    检查过程中的日志不输出到控制台（会打断用户输入），失败原因随结果返回
+
+    Returns:
+        结果为(是否需要刷新, 时间戳, 失败原因)的Future，检查成功时失败原因为None
+    """
+    future: "Future[Tuple[bool, Optional[int], Optional[str]]]" = Future()
+
+    def _run():
+        services_logger = logging.getLogger("services")
+        collector = _LogCollector()
+        services_logger.addHandler(collector)
+        services_logger.propagate = False
+        try:
+            need_refresh, timestamp = asyncio.run(_check_cookie(cookie))
+            error = None
+            if timestamp is None:
+                error = collector.messages[-1] if collector.messages else "未知错误"
+            future.set_result((need_refresh, timestamp, error))
+        except Exception as e:
+            future.set_result((False, None, str(e) or type(e).__name__))
+        finally:
+            services_logger.removeHandler(collector)
+            services_logger.propagate = True
+
+    threading.Thread(target=_run, name="cookie-check", daemon=True).start()
+    return future
 
 
 def main():
     """主函数"""
-    print("=" * 70)
-    print("B站Cookie浏览器信息检测")
-    print("=" * 70)
+    print(banner("B站Cookie浏览器信息检测"))
 
     print("\n📋 当前配置的Cookie信息:")
-    print("-" * 70)
+    print(DASH_LINE)
 
     # 检查Cookie配置
     sessdata = BILIBILI_CONFIG.get("SESSDATA")
@@ -37,34 +166,11 @@ def main():
         print("\n⚠️ 警告：Cookie配置不完整")
         return 1
 
-    print("\n" + "=" * 70)
-    print("🔍 获取你的浏览器User-Agent")
-    print("=" * 70)
-
-    print("\n请按照以下步骤获取你的浏览器User-Agent:")
-    print("-" * 70)
-
-    print("\n方法1：从Console获取（最简单）")
-    print("1. 在B站页面按F12打开开发者工具")
-    print("2. 切换到 [Console] 控制台")
-    print("3. 输入以下命令并回车:")
-    print("   navigator.userAgent")
-    print("4. 复制输出的完整字符串")
-
-    print("\n方法2：从Network面板获取")
-    print("1. 在B站页面按F12打开开发者工具")
-    print("2. 切换到 [Network] 标签")
-    print("3. 刷新页面(F5)")
-    print("4. 点击任意请求")
-    print("5. 在Request Headers中找到 User-Agent")
-    print("6. 复制它的值")
-
-    print("\n" + "-" * 70)
+    # 用户阅读说明、粘贴User-Agent期间，后台检查当前Cookie状态
+    cookie_check = _start_cookie_check(build_bilibili_cookie())
 
     # 获取User-Agent
-    print("\n请粘贴你的User-Agent:")
-    print("（如果留空，将使用默认值）")
-    print()
+    sys.stdout.write(_USER_AGENT_INSTRUCTIONS)
 
     user_agent = input("User-Agent: ").strip()
 
@@ -79,62 +185,46 @@ def main():
             print("[INFO] 已取消")
             return 0
 
-    # 保存到.env
-    print("\n保存中...")
+    # 保存到.env（文件中已是相同值时无需改写；只看文件本身，不受进程环境变量影响）
+    if user_agent == dotenv_values(ENV_FILE).get("USER_AGENT"):
+        print(f"\n[OK] User-Agent与现有配置一致，无需更新: {ENV_FILE}")
+    else:
+        print("\n保存中...")
+        try:
+            update_env_vars(
+                ENV_FILE,
+                {"USER_AGENT": user_agent},
+                comments={"USER_AGENT": "浏览器User-Agent（保持与浏览器一致）"},
+            )
+
+            print(f"[OK] User-Agent已保存到: {ENV_FILE}")
+
+        except Exception as e:
+            print(f"[ERROR] 保存失败: {e}")
+            return 1
+
+    # 等待后台的Cookie检查结果，与配置建议一起整块输出
     try:
-        env_file = Path(__file__).parent.parent / ".env"
-
-        # 读取现有配置
-        env_lines = []
-        if env_file.exists():
-            with open(env_file, "r", encoding="utf-8") as f:
-                env_lines = f.readlines()
-
-        # 查找并更新User-Agent
-        found = False
-        for i, line in enumerate(env_lines):
-            if line.startswith("USER_AGENT="):
-                env_lines[i] = f"USER_AGENT={user_agent}\n"
-                found = True
-                break
-
-        # 如果没找到，添加到末尾
-        if not found:
-            env_lines.append(f"\n# 浏览器User-Agent（保持与浏览器一致）\n")
-            env_lines.append(f"USER_AGENT={user_agent}\n")
-
-        # 写回文件
-        with open(env_file, "w", encoding="utf-8") as f:
-            f.writelines(env_lines)
-
-        print(f"[OK] User-Agent已保存到: {env_file}")
-
-    except Exception as e:
-        print(f"[ERROR] 保存失败: {e}")
-        return 1
-
-    print("\n" + "=" * 70)
-    print("[SUCCESS] 配置完成！")
-    print("=" * 70)
-
-    print("\n✅ 配置建议:")
-    print("-" * 70)
-    print("1. ✅ Cookie已配置")
-    print(
-        "2. ✅ refresh_token已配置" if refresh_token else "2. ⚠️ 建议配置refresh_token"
+        need_refresh, timestamp, error = cookie_check.result(timeout=15)
+    except FutureTimeoutError:
+        need_refresh, timestamp, error = False, None, "检查超时"
+    if timestamp is None:
+        cookie_status = f"4. ⚠️ Cookie状态检查失败（{error}），请确认Cookie是否有效"
+    elif need_refresh:
+        cookie_status = "4. ⚠️ Cookie需要刷新，启动监控后将自动刷新"
+    else:
+        cookie_status = "4. ✅ Cookie有效"
+
+    sys.stdout.write(
+        _SUMMARY_TEMPLATE.format(
+            refresh_token_status=(
+                "2. ✅ refresh_token已配置"
+                if refresh_token
+                else "2. ⚠️ 建议配置refresh_token"
+            ),
+            cookie_status=cookie_status,
+        )
     )
-    print("3. ✅ User-Agent已配置")
-
-    print("\n🔒 安全建议:")
-    print("-" * 70)
-    print("• buvid3 来自你的浏览器，保持不变 ✅")
-    print("• User-Agent 与浏览器匹配，降低风控风险 ✅")
-    print("• refresh_token 启用自动刷新，长期有效 ✅")
-
-    print("\n下一步:")
-    print("1. 重启程序以加载新配置")
-    print("2. 运行测试: uv run python test_api.py")
-    print("3. 启动监控: uv run python main.py --mode monitor")
 
     return 0
 
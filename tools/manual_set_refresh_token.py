@@ -10,6 +10,43 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from tools._console import DASH_LINE, banner
+from tools._env_io import update_env_vars
+
+# 项目根目录下的.env文件
+ENV_FILE = Path(__file__).resolve().parent.parent / ".env"
+
+# 获取refresh_token的操作说明（整块输出，避免逐行print）
+_REFRESH_TOKEN_INSTRUCTIONS = f"""
+📝 如何从浏览器获取refresh_token:
+{DASH_LINE}
+
+方法1：从localStorage获取（推荐）
+1. 在已登录的B站页面，按F12打开开发者工具
+2. 切换到 [Console] 控制台
+3. 输入以下命令并回车:
+   localStorage.getItem('ac_time_value')
+4. 复制输出的字符串（不包括引号）
+
+方法2：从登录请求中获取
+1. 打开B站登录页: https://passport.bilibili.com/login
+2. 按F12打开开发者工具，切换到 [Network] 标签
+3. 完成登录（扫码或密码）
+4. 在Network中找到login相关的请求
+5. 查看Response中的 refresh_token 字段
+
+方法3：从Cookie中查找
+1. 在已登录的B站页面，按F12打开开发者工具
+2. 切换到 [Application] -> [Storage] -> [Cookies]
+3. 查找 ac_time_value 字段的值
+
+{DASH_LINE}
+
+请粘贴你的refresh_token:
+（提示：通常是一串很长的字符串，如：c12a1234567890abcdef...）
+
+"""
+
 
 def update_env_file(refresh_token: str) -> bool:
     """
@@ -22,32 +59,13 @@ def update_env_file(refresh_token: str) -> bool:
         是否成功
     """
     try:
-        env_file = Path(__file__).parent.parent / ".env"
-
-        # 读取现有配置
-        env_lines = []
-        if env_file.exists():
-            with open(env_file, "r", encoding="utf-8") as f:
-                env_lines = f.readlines()
-
-        # 查找并更新refresh_token
-        found = False
-        for i, line in enumerate(env_lines):
-            if line.startswith("refresh_token="):
-                env_lines[i] = f"refresh_token={refresh_token}\n"
-                found = True
-                break
-
-        # 如果没找到，添加到末尾
-        if not found:
-            env_lines.append(f"\n# B站refresh_token（Cookie自动刷新）\n")
-            env_lines.append(f"refresh_token={refresh_token}\n")
-
-        # 写回文件
-        with open(env_file, "w", encoding="utf-8") as f:
-            f.writelines(env_lines)
-
-        print(f"[OK] refresh_token已保存到: {env_file}")
+        update_env_vars(
+            ENV_FILE,
+            {"refresh_token": refresh_token},
+            comments={"refresh_token": "B站refresh_token（Cookie自动刷新）"},
+        )
+
+        print(f"[OK] refresh_token已保存到: {ENV_FILE}")
         return True
 
     except Exception as e:
@@ -57,37 +75,10 @@ def update_env_file(refresh_token: str) -> bool:
 
 def main():
     """主函数"""
-    print("=" * 70)
-    print("手动设置refresh_token - B站Cookie自动刷新")
-    print("=" * 70)
-
-    print("\n📝 如何从浏览器获取refresh_token:")
-    print("-" * 70)
-    print("\n方法1：从localStorage获取（推荐）")
-    print("1. 在已登录的B站页面，按F12打开开发者工具")
-    print("2. 切换到 [Console] 控制台")
-    print("3. 输入以下命令并回车:")
-    print("   localStorage.getItem('ac_time_value')")
-    print("4. 复制输出的字符串（不包括引号）")
-
-    print("\n方法2：从登录请求中获取")
-    print("1. 打开B站登录页: https://passport.bilibili.com/login")
-    print("2. 按F12打开开发者工具，切换到 [Network] 标签")
-    print("3. 完成登录（扫码或密码）")
-    print("4. 在Network中找到login相关的请求")
-    print("5. 查看Response中的 refresh_token 字段")
-
-    print("\n方法3：从Cookie中查找")
-    print("1. 在已登录的B站页面，按F12打开开发者工具")
-    print("2. 切换到 [Application] -> [Storage] -> [Cookies]")
-    print("3. 查找 ac_time_value 字段的值")
-
-    print("\n" + "-" * 70)
+    print(banner("手动设置refresh_token - B站Cookie自动刷新"))
 
     # 获取用户输入
-    print("\n请粘贴你的refresh_token:")
-    print("（提示：通常是一串很长的字符串，如：c12a1234567890abcdef...）")
-    print()
+    sys.stdout.write(_REFRESH_TOKEN_INSTRUCTIONS)
 
     refresh_token = input("refresh_token: ").strip()
 
@@ -105,9 +96,7 @@ def main():
     # 保存到.env
     print("\n保存中...")
     if update_env_file(refresh_token):
-        print("\n" + "=" * 70)
-        print("[SUCCESS] 设置完成！")
-        print("=" * 70)
+        print("\n" + banner("[SUCCESS] 设置完成！"))
         print("\n✅ refresh_token已保存到.env文件")
         print("✅ Cookie自动刷新功能已启用")
         print("\n下一步:")